@@ -0,0 +1,88 @@
+"""Vectorized availability engine for wide date ranges
+
+Each working day is a row of a boolean grid with one cell per `granularity`
+minutes. Busy intervals are painted with a difference array and a
+cumulative sum, and free runs are found with a single np.diff over the whole
+grid, so checking 4-8 weeks costs a handful of NumPy calls instead of a
+Python loop per day.
+
+This is an opt-in engine. The single-pass sweep of get_available_slots_multi_day
+stays the default: it touches each busy interval once rather than every
+minute of every window. benchmarks/grid_vs_sweep.py has the grid ahead
+only on calendars of many stacked meetings checked for a week or more, and
+up to 6x slower on single days.
+
+All times are epoch minutes, as in the intervals module.
+"""
+import numpy as np
+
+
+def free_runs_grid(window_starts, window_ends, busy_starts, busy_ends, min_length=0, granularity=1):
+    """Find free runs of at least min_length minutes in several windows at once
+
+    Args:
+        window_starts (sequence): Start minute of each window (one per day),
+            ascending and non-overlapping
+        window_ends (sequence): End minute of each window
+        busy_starts (sequence): Busy interval starts, in any order
+        busy_ends (sequence): Busy interval ends, parallel to busy_starts
+        min_length (int): Minimum run length in minutes
+        granularity (int): Cell size in minutes. Busy time is rounded out to
+            whole cells and runs start on cell boundaries from the window start.
+
+    Returns:
+        list: One list of (start, end) minute tuples per window
+    """
+    window_starts = np.asarray(window_starts, dtype=np.int64)
+    window_ends = np.asarray(window_ends, dtype=np.int64)
+    busy_starts = np.asarray(busy_starts, dtype=np.int64)
+    busy_ends = np.asarray(busy_ends, dtype=np.int64)
+    days = len(window_starts)
+    if days == 0:
+        return []
+
+    lengths = np.maximum(window_ends - window_starts, 0) // granularity
+    cells = int(lengths.max())
+    if cells == 0:
+        return [[] for _ in range(days)]
+
+    # Map each busy interval to every window it overlaps
+    first = np.searchsorted(window_ends, busy_starts, side='right')
+    last = np.searchsorted(window_starts, busy_ends, side='left') - 1
+    counts = np.maximum(last - first + 1, 0)
+    rows = np.repeat(first, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    starts = np.repeat(busy_starts, counts)
+    ends = np.repeat(busy_ends, counts)
+
+    # Clip to each row's window and convert to cell indices (rounding outwards)
+    origin = window_starts[rows]
+    start_cells = np.clip((starts - origin) // granularity, 0, cells)
+    end_cells = np.clip(-((origin - ends) // granularity), 0, cells)
+    keep = end_cells > start_cells
+
+    # Paint busy cells with a difference array; bincount over flat cell
+    # indices is far cheaper than np.add.at
+    width = cells + 1
+    rows, start_cells, end_cells = rows[keep], start_cells[keep], end_cells[keep]
+    diff = (np.bincount(rows * width + start_cells, minlength=days * width)
+            - np.bincount(rows * width + end_cells, minlength=days * width)).reshape(days, width)
+    free = np.cumsum(diff[:, :cells], axis=1) == 0
+    # Cells past a shorter window's end are never free
+    free &= np.arange(cells) < lengths[:, None]
+
+    # Run-length detection over the padded grid
+    padded = np.zeros((days, cells + 2), dtype=np.int8)
+    padded[:, 1:-1] = free
+    edges = np.diff(padded, axis=1)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    _, run_ends = np.nonzero(edges == -1)
+    min_cells = -(-max(min_length, 1) // granularity)
+    long_enough = run_ends - run_starts >= min_cells
+
+    result = [[] for _ in range(days)]
+    for row, start, end in zip(
+        run_rows[long_enough].tolist(), run_starts[long_enough].tolist(), run_ends[long_enough].tolist()
+    ):
+        origin = int(window_starts[row])
+        result[row].append((origin + start * granularity, origin + end * granularity))
+    return result
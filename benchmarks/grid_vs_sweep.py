@@ -0,0 +1,55 @@
+"""Compare the single-pass sweep with the NumPy availability grid
+
+Usage: python benchmarks/grid_vs_sweep.py
+
+Times get_available_slots_multi_day against get_available_slots_grid on the
+synthetic profiles of synthetic.py for ranges of 1 day to 1 year, and
+prints which engine wins each case. Runs headless; no calendar backend
+query is timed.
+
+The sweep is the default engine. The grid only wins on the 'overlapping'
+profile (many stacked meetings) from a week up.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from calendar_backend import MemoryCalendarBackend
+from main import get_available_slots_grid, get_available_slots_multi_day
+from synthetic import FIRST_DAY, PROFILES, populate, target_dates
+
+WORKING_HOURS = {'start': '09:00', 'end': '18:00'}
+DURATION = 30
+SPANS = (1, 7, 14, 28, 56, 365)  # Days
+REPEATS = 5
+
+
+def best_ms(func):
+    number = 10
+    return min(timeit.repeat(func, number=number, repeat=REPEATS)) / number * 1000
+
+
+def main():
+    print(f"{'profile':<12} {'days':>5} {'sweep ms':>10} {'grid ms':>10} {'grid/sweep':>11}  faster")
+    wins = 0
+    cases = 0
+    for profile in PROFILES:
+        for days in SPANS:
+            backend = MemoryCalendarBackend()
+            name, = populate(backend, profile, FIRST_DAY, days + 1)
+            dates = target_dates(FIRST_DAY, days)
+            events = backend.get_events_for_range(name, dates[0], dates[-1])
+
+            sweep = best_ms(lambda: get_available_slots_multi_day(events, dates, WORKING_HOURS, DURATION))
+            grid = best_ms(lambda: get_available_slots_grid(events, dates, WORKING_HOURS, DURATION))
+            wins += grid < sweep
+            cases += 1
+            print(f"{profile:<12} {days:>5} {sweep:>10.3f} {grid:>10.3f} {grid / sweep:>10.2f}x  "
+                  f"{'grid' if grid < sweep else 'sweep'}")
+    print(f"\nThe grid was faster in {wins} of {cases} cases")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""The pre-sweep slot engine, kept as a benchmark reference
+
+A port of the original get_available_slots: for each day, the working
+window starts as one free slot and is split around every busy period that
+starts on that day, using timezone-aware datetimes throughout. Only used to
+time the sweep against; its results differ from the sweep's for events
+starting the day before.
+"""
+from datetime import datetime, timedelta
+
+from timezones import get_zone
+
+
+def legacy_slots_multi_day(events_by_date, target_dates, working_hours, duration_minutes=60):
+    """Return {date: slots} like get_available_slots_multi_day, one subtraction per day"""
+    local_tz = get_zone()
+    duration = timedelta(minutes=duration_minutes)
+    all_slots = {}
+    for target_date in target_dates:
+        date_str = target_date.strftime('%Y-%m-%d')
+        day_start = datetime.strptime(f"{date_str} {working_hours['start']}", '%Y-%m-%d %H:%M').replace(tzinfo=local_tz)
+        day_end = datetime.strptime(f"{date_str} {working_hours['end']}", '%Y-%m-%d %H:%M').replace(tzinfo=local_tz)
+
+        target_events = []
+        for start, end in events_by_date.get(target_date.date(), ()):
+            start = start.replace(tzinfo=local_tz)
+            end = end.replace(tzinfo=local_tz)
+            if start.date() == target_date.date():
+                target_events.append((start, end))
+
+        available_slots = [(day_start, day_end)]
+        for busy_start, busy_end in target_events:
+            remaining = []
+            for avail_start, avail_end in available_slots:
+                if busy_start < avail_end and busy_end > avail_start:
+                    if busy_start > avail_start:
+                        remaining.append((avail_start, busy_start))
+                    if busy_end < avail_end:
+                        remaining.append((busy_end, avail_end))
+                else:
+                    remaining.append((avail_start, avail_end))
+            available_slots = remaining
+        all_slots[target_date.date()] = [(start, end) for start, end in available_slots if end - start >= duration]
+    return all_slots
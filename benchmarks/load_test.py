@@ -0,0 +1,101 @@
+"""Load test for the local HTTP availability service
+
+Usage:
+    python3 server.py &
+    python benchmarks/load_test.py [--port 8765] [--connections 8] [--requests 200]
+
+Opens several keep-alive connections and sends GET /availability requests on
+each as fast as the server answers, then reports throughput and p50/p99
+latency. The query defaults to the next five working days; pass --query to
+test something else.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+
+def default_query():
+    first = datetime.now().date() + timedelta(days=1)
+    dates = ','.join((first + timedelta(days=offset)).isoformat() for offset in range(5))
+    return f"dates={dates}&duration=30"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def read_response(reader):
+    """Read one HTTP response; returns its status code"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(host, port, path, count, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode('latin-1')
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    path = f"/availability?{args.query or default_query()}"
+    latencies = []
+    errors = []
+    per_connection = max(1, args.requests // args.connections)
+
+    # One warm-up request so the first cold calendar query is not measured
+    await client(args.host, args.port, path, 1, [], [])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, path, per_connection, latencies, errors)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests:    {len(latencies)} over {args.connections} connections")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"p50 latency: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"p99 latency: {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"mean:        {statistics.mean(latencies) * 1000:.2f} ms")
+    if errors:
+        print(f"errors:      {len(errors)} non-200 responses (first: {errors[0]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the availability server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='Total requests across all connections')
+    parser.add_argument('--query', help="Query string, e.g. 'next=3&duration=60'")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Guard the cold-start import path of the menu bar app
+
+Usage: python benchmarks/startup_imports.py [--module gui] [--budget-ms 400]
+
+Imports the module in a fresh interpreter under `python -X importtime`,
+prints the slowest imports and fails (exit status 1) if a module that
+should load lazily shows up, or if the total import time exceeds the
+budget. Heavy dependencies (EventKit, geopy, timezonefinder, NumPy) belong
+on the background warm-up, not on the path to the tray icon.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+LAZY_MODULES = (
+    'EventKit', 'Foundation', 'objc',
+    'geopy', 'timezonefinder', 'numpy',
+    'calendar_access', 'ics_backend', 'recurrence', 'freebusy_index', 'availability_grid',
+)
+
+
+def import_times(module):
+    """Import module in a fresh interpreter; return {name: (self_us, cumulative_us)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the startup import path')
+    parser.add_argument('--module', default='gui', help='Module imported at startup (default: gui)')
+    parser.add_argument('--budget-ms', type=float, default=400, help='Maximum total import time (default: 400)')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list')
+    args = parser.parse_args()
+
+    try:
+        times = import_times(args.module)
+    except RuntimeError as e:
+        print(f"Could not import {args.module}: {e}")
+        sys.exit(2)
+    total_ms = times[args.module][1] / 1000
+
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}  {name}")
+    print(f"\nimport {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    eager = sorted(name for name in times if name.split('.')[0] in LAZY_MODULES)
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms is over budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
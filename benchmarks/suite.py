@@ -0,0 +1,208 @@
+"""Benchmark suite for the availability pipeline
+
+Usage:
+    python benchmarks/suite.py                    run and print every case
+    python benchmarks/suite.py --save-baseline    also store the timings
+    python benchmarks/suite.py --check            fail if slower than the baseline
+    python benchmarks/suite.py --filter sweep     only cases whose name contains 'sweep'
+
+Runs the slot engine against synthetic calendars (see synthetic.py) held in
+a MemoryCalendarBackend, so it needs neither EventKit nor a display. Cases
+cover event conversion, cold backend fetches, get_available_slots,
+multi-calendar intersection and email formatting, over 1 day to 1 year and
+1 to 20 calendars.
+
+Slot computation is timed for three implementations on the same events:
+the default sweep, the original per-day subtraction (legacy.py) and the
+opt-in NumPy grid, if NumPy is installed. After the cases, a table gives
+each implementation's time relative to the sweep.
+
+Each case reports the best per-call time of several repeats. The baseline is
+a JSON file of those timings; --check exits with status 1 if a case got
+slower than the baseline by more than the tolerance. Baselines are only
+comparable on the same machine and Python version.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from calendar_backend import MemoryCalendarBackend, bucket_intervals_by_day, day_span, set_backend
+from legacy import legacy_slots_multi_day
+from main import (format_multiple_days_email, get_available_slots, get_available_slots_grid,
+                  get_available_slots_multi_day, get_common_available_slots)
+from synthetic import FIRST_DAY, PROFILES, populate, synthetic_calendar, target_dates
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+WORKING_HOURS = {'start': '09:00', 'end': '18:00'}
+DURATION = 30
+SPANS = (1, 7, 30, 365)  # Days
+CALENDAR_COUNTS = (1, 5, 20)
+MIN_REPEAT_SECONDS = 0.02  # Calls are batched so one repeat takes at least this long
+NOISE_FLOOR_MS = 0.02  # Differences below this are never reported as regressions
+ENGINES = ('sweep', 'legacy', 'grid')  # Slot implementations compared; the first is the reference
+
+
+def _has_numpy():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def single_calendar_cases(profile, days):
+    """Yield (name, callable) cases on one calendar of a profile"""
+    backend = MemoryCalendarBackend()
+    name, = populate(backend, profile, FIRST_DAY, days + 1)
+    set_backend(backend)
+    dates = target_dates(FIRST_DAY, days)
+    span_start, span_end = day_span(dates[0], dates[-1])
+    starts, ends, flags = synthetic_calendar(profile, FIRST_DAY, days)
+    events = backend.get_events_for_range(name, dates[0], dates[-1])
+    slots = get_available_slots_multi_day(events, dates, WORKING_HOURS, DURATION)
+    suffix = f"{profile}/{days}d"
+
+    def fetch_cold():
+        backend.invalidate_cache()
+        backend.get_events_for_range(name, dates[0], dates[-1])
+
+    yield f"convert/{suffix}", lambda: bucket_intervals_by_day(starts, ends, span_start, span_end, flags)
+    yield f"fetch_cold/{suffix}", fetch_cold
+    yield f"sweep/{suffix}", lambda: get_available_slots_multi_day(events, dates, WORKING_HOURS, DURATION)
+    yield f"legacy/{suffix}", lambda: legacy_slots_multi_day(events, dates, WORKING_HOURS, DURATION)
+    if _has_numpy():
+        yield f"grid/{suffix}", lambda: get_available_slots_grid(events, dates, WORKING_HOURS, DURATION)
+    yield f"format/{suffix}", lambda: format_multiple_days_email(slots)
+    if days == 1:
+        yield f"get_available_slots/{profile}", lambda: get_available_slots(name, dates[0], WORKING_HOURS, DURATION)
+
+
+def multi_calendar_cases(calendars, days, profile='dense'):
+    """Yield (name, callable) cases intersecting several calendars"""
+    backend = MemoryCalendarBackend()
+    names = populate(backend, profile, FIRST_DAY, days + 1, calendars)
+    set_backend(backend)
+    dates = target_dates(FIRST_DAY, days)
+    yield (f"common/{profile}/{calendars}cal/{days}d",
+           lambda: get_common_available_slots(names, dates, WORKING_HOURS, DURATION))
+    yield (f"quorum/{profile}/{calendars}cal/{days}d",
+           lambda: get_common_available_slots(names, dates, WORKING_HOURS, DURATION, quorum=max(1, calendars - 1)))
+
+
+def all_cases():
+    for profile in PROFILES:
+        for days in SPANS:
+            yield from single_calendar_cases(profile, days)
+    for calendars in CALENDAR_COUNTS:
+        for days in (7, 365):
+            yield from multi_calendar_cases(calendars, days)
+
+
+def measure(func, repeat):
+    """Return the best per-call time of func in milliseconds"""
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    number = max(1, min(10000, int(MIN_REPEAT_SECONDS / max(elapsed, 1e-9))))
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+
+def print_comparison(results):
+    """Print each slot implementation's time relative to the sweep, per profile and span"""
+    reference = ENGINES[0]
+    rows = [name.split('/', 1)[1] for name in results if name.startswith(reference + '/')]
+    others = [engine for engine in ENGINES[1:] if any(f"{engine}/{row}" in results for row in rows)]
+    if not rows or not others:
+        return
+    print(f"\n{'slots vs ' + reference:<40}" + ''.join(f"{engine:>10}" for engine in others))
+    for row in rows:
+        ratios = ''.join(
+            f"{results[f'{engine}/{row}'] / results[f'{reference}/{row}']:>9.2f}x"
+            if f"{engine}/{row}" in results else f"{'':>10}"
+            for engine in others
+        )
+        print(f"{row:<40}{ratios}")
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(path, results):
+    baseline = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def find_regressions(results, baseline, tolerance):
+    """Return (name, baseline_ms, current_ms) for cases slower than allowed"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        if current > previous * (1 + tolerance) and current - previous > NOISE_FLOOR_MS:
+            regressions.append((name, previous, current))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the availability pipeline')
+    parser.add_argument('--filter', help='Only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeats per case; the best is kept (default: 5)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file (default: benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown against the baseline, as a fraction (default: 0.25)')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    if args.check and baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        sys.exit(2)
+    if baseline and baseline.get('python') != platform.python_version():
+        print(f"Note: baseline was recorded with Python {baseline.get('python')}")
+
+    results = {}
+    print(f"{'case':<40} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for name, func in all_cases():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+        previous = baseline['results'].get(name) if baseline else None
+        comparison = f"{previous:>10.3f} {(results[name] / previous - 1) * 100:>+7.0f}%" if previous else ''
+        print(f"{name:<40} {results[name]:>10.3f} {comparison}")
+    print_comparison(results)
+
+    if args.save_baseline:
+        if baseline and args.filter:
+            # Keep the timings of the cases that were not run
+            results = {**baseline['results'], **results}
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for name, previous, current in regressions:
+            print(f"REGRESSION: {name} {previous:.3f} ms -> {current:.3f} ms")
+        if args.check and regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Synthetic calendars for the benchmarks
+
+Every generator is seeded, so the same profile, span and seed always give
+the same events. Times are local wall-clock times like the real backends.
+
+Profiles:
+    sparse       a couple of meetings per working day
+    dense        a full working day of 15-90 minute meetings
+    overlapping  many long meetings stacked on top of each other
+    all_day      several all-day events per day plus a few meetings
+"""
+import random
+from datetime import datetime, timedelta
+
+from calendar_backend import BusyIntervals
+
+PROFILES = ('sparse', 'dense', 'overlapping', 'all_day')
+FIRST_DAY = datetime(2025, 1, 6)  # A fixed Monday keeps runs comparable
+
+
+def _meetings(rng, day, count, min_minutes, max_minutes, first_hour=7, last_hour=19):
+    for _ in range(count):
+        start = day.replace(hour=rng.randint(first_hour, last_hour), minute=rng.choice((0, 15, 30, 45)))
+        end = start + timedelta(minutes=rng.randint(min_minutes, max_minutes))
+        yield start.timestamp(), end.timestamp(), 0
+
+
+def _day_events(profile, rng, day):
+    working_day = day.weekday() < 5
+    if profile == 'sparse':
+        return _meetings(rng, day, rng.randint(0, 3) if working_day else 0, 30, 60)
+    if profile == 'dense':
+        return _meetings(rng, day, rng.randint(8, 12) if working_day else rng.randint(0, 2), 15, 90)
+    if profile == 'overlapping':
+        return _meetings(rng, day, rng.randint(20, 30), 30, 240, first_hour=0, last_hour=22)
+    if profile == 'all_day':
+        next_day = (day + timedelta(days=1)).timestamp()
+        events = [(day.timestamp(), next_day, BusyIntervals.FLAG_ALL_DAY) for _ in range(rng.randint(2, 5))]
+        return events + list(_meetings(rng, day, rng.randint(0, 4), 30, 60))
+    raise ValueError(f"Unknown profile '{profile}'")
+
+
+def synthetic_calendar(profile, first_day, days, seed=42):
+    """Generate one calendar's events
+
+    Args:
+        profile (str): One of PROFILES
+        first_day (datetime): Local midnight of the first day
+        days (int): Number of days to fill
+        seed (int): Random seed
+
+    Returns:
+        tuple: (starts, ends, flags) lists, epoch seconds and BusyIntervals flags
+    """
+    rng = random.Random(f"{profile}:{seed}")
+    starts, ends, flags = [], [], []
+    for offset in range(days):
+        for start_ts, end_ts, event_flags in _day_events(profile, rng, first_day + timedelta(days=offset)):
+            starts.append(start_ts)
+            ends.append(end_ts)
+            flags.append(event_flags)
+    return starts, ends, flags
+
+
+def populate(backend, profile, first_day, days, calendars=1, seed=42):
+    """Fill a MemoryCalendarBackend with synthetic calendars
+
+    Returns:
+        list: The calendar names, 'Calendar 1' to 'Calendar <calendars>'
+    """
+    names = []
+    for number in range(1, calendars + 1):
+        name = f"Calendar {number}"
+        backend.set_events(name, *synthetic_calendar(profile, first_day, days, seed + number))
+        names.append(name)
+    return names
+
+
+def target_dates(first_day, days):
+    """The datetimes of the days in a span, as the slot engine takes them"""
+    return [first_day + timedelta(days=offset) for offset in range(days)]
+
@@ -1,19 +1,27 @@
-from datetime import datetime
-from Foundation import NSDate
+import os
+import sys
+import threading
+from Foundation import NSDate, NSNotificationCenter
 from EventKit import (
     EKEventStore, 
+    EKEventStoreChangedNotification,
     EKSpan, 
     EKEntityMaskEvent, 
     EKEntityTypeEvent
 )
 
+from calendar_backend import CalendarAccessError, CalendarBackend, BusyIntervals, bucket_intervals_by_day
+from tracing import span
 
-class CalendarAccessError(Exception):
-    """Custom exception for calendar access errors"""
-    pass
+# Calendar's local store, written on every change including syncs made while
+# this app is closed; the first that exists is used
+CALENDAR_STORE_FILES = (
+    '~/Library/Group Containers/group.com.apple.calendar/Calendar.sqlitedb',  # macOS 14 and later
+    '~/Library/Calendars/Calendar.sqlitedb',
+)
 
 
-class CalendarAccess:
+class CalendarAccess(CalendarBackend):
     _instance = None
     
     @classmethod
@@ -26,14 +34,25 @@ class CalendarAccess:
     def __init__(self):
             """Initialize EventKit store and request access"""
             import time
+            super().__init__()
             self.store = EKEventStore.alloc().init()
             self.access_granted = False
+            self._registry = None
+            self._registry_lock = threading.Lock()
+            
+            # Drop cached calendars and events whenever the store reports a change
+            self._change_observer = NSNotificationCenter.defaultCenter().addObserverForName_object_queue_usingBlock_(
+                EKEventStoreChangedNotification,
+                self.store,
+                None,
+                self._on_store_changed
+            )
             
             # Check current authorization status
             auth_status = EKEventStore.authorizationStatusForEntityType_(EKEntityTypeEvent)
             
             if auth_status == 0:  # Not determined
-                print("Requesting calendar access...")
+                print("Requesting calendar access...", file=sys.stderr)
                 # Request access and wait for response
                 self.store.requestAccessToEntityType_completion_(
                     EKEntityTypeEvent,
@@ -48,81 +67,122 @@ class CalendarAccess:
                     
             elif auth_status == 3:  # Authorized
                 self.access_granted = True
-                print("Calendar access already granted")
+                print("Calendar access already granted", file=sys.stderr)
             else:
-                print("Calendar access denied. Please grant access in System Settings > Privacy & Security > Calendars")
+                print("Calendar access denied. Please grant access in System Settings > Privacy & Security > Calendars", file=sys.stderr)
     
-    def list_calendars(self):
-        """List all available calendars"""
+    def _on_store_changed(self, notification):
+        """EKEventStoreChangedNotification handler"""
+        with self._registry_lock:
+            self._registry = None
+        self.invalidate_cache()
+    
+    def _source_signature(self, calendar_name):
+        """Change marker for the free/busy index: mtime and size of Calendar's store
+
+        The store holds every calendar, so a change to any of them discards
+        the index of all of them. None, leaving the index to expire day by
+        day, if the store cannot be found.
+        """
+        for path in CALENDAR_STORE_FILES:
+            path = os.path.expanduser(path)
+            signature = []
+            for name in (path, path + '-wal'):
+                try:
+                    stat = os.stat(name)
+                except OSError:
+                    continue
+                signature.extend((stat.st_mtime_ns, stat.st_size))
+            if signature:
+                return [calendar_name, *signature]
+        return None
+    
+    def _get_registry(self):
+        """Return (calendars by identifier, identifier by title, titles)
+        
+        Built from the store once and rebuilt only after it reports a change,
+        so lookups cost no Objective-C bridge calls.
+        """
         if not self.access_granted:
             raise CalendarAccessError("Calendar access not granted")
         
-        return [cal.title() for cal in self.store.calendars()]
+        with self._registry_lock:
+            if self._registry is None:
+                calendars = {}
+                identifiers = {}
+                titles = []
+                for calendar in self.store.calendars():
+                    identifier = calendar.calendarIdentifier()
+                    title = calendar.title()
+                    calendars[identifier] = calendar
+                    identifiers.setdefault(title, identifier)
+                    titles.append(title)
+                self._registry = (calendars, identifiers, titles)
+            return self._registry
+    
+    def list_calendars(self):
+        """List all available calendars"""
+        return list(self._get_registry()[2])
+    
+    def has_calendar(self, calendar_name):
+        """Check whether a calendar with this title exists"""
+        return calendar_name in self._get_registry()[1]
     
     def get_calendar_by_name(self, calendar_name):
         """Get a specific calendar by name"""
-        if not self.access_granted:
-            raise CalendarAccessError("Calendar access not granted")
-            
-        for calendar in self.store.calendars():
-            if calendar.title() == calendar_name:
-                return calendar
-        return None
+        calendars, identifiers, _ = self._get_registry()
+        identifier = identifiers.get(calendar_name)
+        return calendars.get(identifier) if identifier else None
     
-    def get_events_for_date(self, calendar_name, target_date):
-        """Get events for a specific date
+    def get_calendar_by_identifier(self, identifier):
+        """Get a specific calendar by its stable calendarIdentifier"""
+        return self._get_registry()[0].get(identifier)
+    
+    def _fetch_events_for_range(self, calendar_name, span_start, span_end):
+        """Get events for a span of days with a single store query
         
         Args:
             calendar_name (str): Name of the calendar to query
-            target_date (datetime): The date to get events for
+            span_start (datetime): Start of the first day (00:00:00)
+            span_end (datetime): End of the last day (23:59:59)
             
         Returns:
-            list: List of (start_datetime, end_datetime) tuples
+            dict: Maps each date in the span to a BusyIntervals. Events
+                spanning several days are listed under every day they overlap.
         """
-        import time
-        start_time = time.time()
-        
         if not self.access_granted:
             raise CalendarAccessError("Calendar access not granted")
-            
+        
         # Get the calendar
-        calendar = self.get_calendar_by_name(calendar_name)
+        with span('calendar.lookup'):
+            calendar = self.get_calendar_by_name(calendar_name)
         if not calendar:
             raise CalendarAccessError(f"Calendar '{calendar_name}' not found")
         
-        # Create start and end dates for the query
-        start_date = target_date.replace(hour=0, minute=0, second=0)
-        start_date_ns = NSDate.dateWithTimeIntervalSince1970_(start_date.timestamp())
-        
-        end_date = target_date.replace(hour=23, minute=59, second=59)
-        end_date_ns = NSDate.dateWithTimeIntervalSince1970_(end_date.timestamp())
-        
-        print(f"Calendar setup took: {time.time() - start_time:.2f} seconds")
-        query_start = time.time()
-        
-        # Create the predicate for the query
-        predicate = self.store.predicateForEventsWithStartDate_endDate_calendars_(
-            start_date_ns,
-            end_date_ns,
-            [calendar]
-        )
+        start_date_ns = NSDate.dateWithTimeIntervalSince1970_(span_start.timestamp())
+        end_date_ns = NSDate.dateWithTimeIntervalSince1970_(span_end.timestamp())
         
-        # Fetch events
-        events = self.store.eventsMatchingPredicate_(predicate)
-        print(f"Event query took: {time.time() - query_start:.2f} seconds")
+        # Single predicate for the whole span
+        with span('calendar.query') as query_span:
+            predicate = self.store.predicateForEventsWithStartDate_endDate_calendars_(
+                start_date_ns,
+                end_date_ns,
+                [calendar]
+            )
+            events = self.store.eventsMatchingPredicate_(predicate)
+            query_span.set(events=len(events) if events else 0)
         
-        # Filter and format results
-        format_start = time.time()
-        result = []
-        for event in events:
-            if not event.isAllDay():  # Skip all-day events
-                start_ts = event.startDate().timeIntervalSince1970()
-                end_ts = event.endDate().timeIntervalSince1970()
-                start = datetime.fromtimestamp(start_ts)
-                end = datetime.fromtimestamp(end_ts)
-                result.append((start, end))
-        
-        print(f"Event formatting took: {time.time() - format_start:.2f} seconds")
-        print(f"Total calendar query took: {time.time() - start_time:.2f} seconds")
+        # Pull every column out in one bridge call each (key-value coding on
+        # the NSArray) instead of several calls per event
+        with span('calendar.convert'):
+            if events:
+                starts = list(events.valueForKeyPath_("startDate.timeIntervalSince1970"))
+                ends = list(events.valueForKeyPath_("endDate.timeIntervalSince1970"))
+                flags = [BusyIntervals.FLAG_ALL_DAY if all_day else 0 for all_day in events.valueForKey_("allDay")]
+            else:
+                starts, ends, flags = [], [], []
+            
+            # Bucket events by every day they overlap
+            result = bucket_intervals_by_day(starts, ends, span_start, span_end, flags)
         
-        return result
\ No newline at end of file
+        return result
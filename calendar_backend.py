@@ -0,0 +1,382 @@
+import math
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from tracing import span
+
+
+class CalendarAccessError(Exception):
+    """Custom exception for calendar access errors"""
+    pass
+
+
+class CalendarBackend:
+    """Interface shared by all calendar providers
+
+    A backend exposes calendars by title and returns busy periods as
+    BusyIntervals, which iterate as (start_datetime, end_datetime) tuples of
+    naive local datetimes with all-day events skipped.
+
+    Results are cached in memory per calendar and per day, and in the
+    persistent free/busy index if one is attached. Subclasses implement
+    _fetch_events_for_range and call invalidate_cache (or invalidate_range)
+    when their source changes, or override _validate_cache to check it
+    before use.
+    """
+
+    def __init__(self):
+        self._day_cache = {}  # (calendar_name, date) -> BusyIntervals
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0  # Bumped on invalidation to discard in-flight fetches
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.index_hits = 0
+        self.freebusy_index = None  # Optional FreeBusyIndex shared across runs
+
+    def list_calendars(self):
+        """List all available calendars"""
+        raise NotImplementedError
+
+    def has_calendar(self, calendar_name):
+        """Check whether a calendar with this title exists"""
+        return calendar_name in self.list_calendars()
+
+    def _fetch_events_for_range(self, calendar_name, span_start, span_end):
+        """Query the source for one calendar, bypassing the cache
+
+        Args:
+            calendar_name (str): Name of the calendar to query
+            span_start (datetime): Start of the first day (00:00:00)
+            span_end (datetime): End of the last day (23:59:59)
+
+        Returns:
+            dict: Maps each date in the span to a BusyIntervals
+        """
+        raise NotImplementedError
+
+    def _validate_cache(self, calendar_name):
+        """Hook to drop stale cache entries before a lookup"""
+        pass
+
+    def _source_signature(self, calendar_name):
+        """Hook returning a JSON-serializable change marker for a calendar's source
+
+        The free/busy index is discarded when the marker differs from the one
+        it was built with. None means the source has no such marker.
+        """
+        return None
+
+    def invalidate_cache(self, calendar_name=None):
+        """Drop cached events for one calendar, or for all of them"""
+        with self._cache_lock:
+            self._cache_generation += 1
+            if calendar_name is None:
+                self._day_cache.clear()
+            else:
+                for key in [key for key in self._day_cache if key[0] == calendar_name]:
+                    del self._day_cache[key]
+        if self.freebusy_index is not None:
+            self.freebusy_index.invalidate(calendar_name)
+
+    def invalidate_range(self, calendar_name, start_ts, end_ts):
+        """Drop cached days of one calendar that touch [start_ts, end_ts]
+
+        Used when a source can tell which events changed, so the rest of the
+        cache and the free/busy index stay valid.
+        """
+        first = datetime.fromtimestamp(start_ts).date() - timedelta(days=1)
+        last = datetime.fromtimestamp(end_ts).date() + timedelta(days=1)
+        with self._cache_lock:
+            self._cache_generation += 1
+            for key in [key for key in self._day_cache if key[0] == calendar_name and first <= key[1] <= last]:
+                del self._day_cache[key]
+        if self.freebusy_index is not None:
+            self.freebusy_index.invalidate_range(calendar_name, start_ts, end_ts)
+
+    def cache_stats(self):
+        """Return cache hit/miss counters and the number of cached days"""
+        with self._cache_lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'index_hits': self.index_hits,
+                'cached_days': len(self._day_cache),
+            }
+
+    def get_events_for_range(self, calendar_names, start, end):
+        """Get events for a span of dates
+
+        Days already in the cache are answered from memory; the remaining
+        days of each calendar are fetched with one query.
+
+        Args:
+            calendar_names (str or list): Calendar name(s) to query
+            start (datetime): First date of the span
+            end (datetime): Last date of the span (inclusive)
+
+        Returns:
+            dict: Maps each date in the span to a BusyIntervals. Events
+                spanning several days are listed under every day they overlap.
+        """
+        if isinstance(calendar_names, str):
+            calendar_names = [calendar_names]
+
+        span_start, span_end = day_span(start, end)
+        days = span_days(span_start, span_end)
+        result = {day: BusyIntervals() for day in days}
+
+        for calendar_name in calendar_names:
+            self._validate_cache(calendar_name)
+            with self._cache_lock:
+                missing = [day for day in days if (calendar_name, day) not in self._day_cache]
+                self.cache_hits += len(days) - len(missing)
+                self.cache_misses += len(missing)
+                generation = self._cache_generation
+
+            fetched = {}
+            if missing and self.freebusy_index is not None:
+                signature = self._source_signature(calendar_name)
+                with span('index.read', days=len(missing)):
+                    fetched = self.freebusy_index.read_days(calendar_name, missing, signature)
+                missing = [day for day in missing if day not in fetched]
+                with self._cache_lock:
+                    self.index_hits += len(fetched)
+
+            if missing:
+                fetch_start, fetch_end = day_span(
+                    datetime.combine(missing[0], datetime.min.time()),
+                    datetime.combine(missing[-1], datetime.min.time())
+                )
+                with span('calendar.fetch', calendar=calendar_name, days=len(missing)):
+                    fetched.update(self._fetch_events_for_range(calendar_name, fetch_start, fetch_end))
+                if self.freebusy_index is not None:
+                    with self._cache_lock:
+                        current = generation == self._cache_generation
+                    if current:
+                        with span('index.write'):
+                            self.freebusy_index.write_span(calendar_name, fetch_start, fetch_end, fetched, signature)
+
+            if fetched:
+                with self._cache_lock:
+                    # Results fetched across an invalidation may already be stale
+                    if generation == self._cache_generation:
+                        for day, events in fetched.items():
+                            self._day_cache[(calendar_name, day)] = events
+
+            with self._cache_lock:
+                for day in days:
+                    events = fetched.get(day)
+                    if events is None:
+                        events = self._day_cache.get((calendar_name, day))
+                    if events is not None:
+                        result[day].extend(events)
+        return result
+
+    def get_events_for_date(self, calendar_name, target_date):
+        """Get events for a specific date
+
+        Args:
+            calendar_name (str): Name of the calendar to query
+            target_date (datetime): The date to get events for
+
+        Returns:
+            BusyIntervals: Iterates as (start_datetime, end_datetime) tuples
+        """
+        return self.get_events_for_range(calendar_name, target_date, target_date)[target_date.date()]
+
+
+def day_span(start, end):
+    """Return the (first_day_start, last_day_end) datetimes covering a span of dates"""
+    span_start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    span_end = end.replace(hour=23, minute=59, second=59, microsecond=0)
+    return span_start, span_end
+
+
+class BusyIntervals:
+    """Compact, array-backed list of busy periods
+
+    Start and end times are kept as parallel array('q') columns of epoch
+    seconds, with a flags column alongside. Iterating yields
+    (start_datetime, end_datetime) tuples of naive local datetimes, like the
+    plain lists older callers expect, while the slot engine reads the
+    columns directly and never builds per-event datetimes. All-day entries
+    are kept in the columns but skipped by iteration and len().
+    """
+
+    FLAG_ALL_DAY = 1
+
+    __slots__ = ('starts', 'ends', 'flags')
+
+    def __init__(self):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.flags = array('B')
+
+    @classmethod
+    def from_datetimes(cls, periods):
+        """Build from (start, end) datetimes; naive datetimes are local time"""
+        intervals = cls()
+        for start, end in periods:
+            intervals.append(start.timestamp(), end.timestamp())
+        return intervals
+
+    def append(self, start_ts, end_ts, flags=0):
+        """Add a period, rounding outwards to whole seconds"""
+        self.starts.append(math.floor(start_ts))
+        self.ends.append(math.ceil(end_ts))
+        self.flags.append(flags)
+
+    def extend(self, other):
+        self.starts.extend(other.starts)
+        self.ends.extend(other.ends)
+        self.flags.extend(other.flags)
+
+    def timed_columns(self):
+        """Return (starts, ends) epoch-second columns without all-day entries"""
+        if not any(self.flags):
+            return self.starts, self.ends
+        keep = [i for i, flags in enumerate(self.flags) if not flags & self.FLAG_ALL_DAY]
+        return array('q', (self.starts[i] for i in keep)), array('q', (self.ends[i] for i in keep))
+
+    def __len__(self):
+        return sum(1 for flags in self.flags if not flags & self.FLAG_ALL_DAY)
+
+    def __iter__(self):
+        for start_ts, end_ts in zip(*self.timed_columns()):
+            yield datetime.fromtimestamp(start_ts), datetime.fromtimestamp(end_ts)
+
+    def __repr__(self):
+        return f"BusyIntervals({list(self)!r})"
+
+
+def span_days(span_start, span_end):
+    """Return the list of dates from span_start to span_end"""
+    days = []
+    day = span_start.date()
+    while day <= span_end.date():
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def bucket_intervals_by_day(starts, ends, span_start, span_end, flags=None):
+    """Bucket epoch-second periods by every local day in the span they overlap
+
+    Args:
+        starts (sequence): Period starts in epoch seconds
+        ends (sequence): Period ends in epoch seconds, parallel to starts
+        span_start (datetime): Start of the first day
+        span_end (datetime): End of the last day
+        flags (sequence): Optional BusyIntervals flags, parallel to starts
+
+    Returns:
+        dict: One (possibly empty) BusyIntervals per date in the span
+    """
+    days = span_days(span_start, span_end)
+    result = {day: BusyIntervals() for day in days}
+    # Local midnights, plus the midnight closing the last day
+    bounds = [datetime.combine(day, datetime.min.time()).timestamp() for day in days]
+    bounds.append(datetime.combine(days[-1] + timedelta(days=1), datetime.min.time()).timestamp())
+
+    for i in range(len(starts)):
+        start_ts, end_ts = starts[i], ends[i]
+        event_flags = flags[i] if flags is not None else 0
+        day_index = max(bisect_right(bounds, start_ts) - 1, 0)
+        while day_index < len(days) and start_ts < bounds[day_index + 1]:
+            # An event ending exactly at midnight does not occupy the next day
+            if end_ts > bounds[day_index]:
+                result[days[day_index]].append(start_ts, end_ts, event_flags)
+            day_index += 1
+            if end_ts <= bounds[day_index]:
+                break
+    return result
+
+
+class MemoryCalendarBackend(CalendarBackend):
+    """Calendars held in memory, for benchmarks and headless runs
+
+    Events are kept per calendar as epoch-second columns sorted by start, and
+    go through the same day bucketing and caches as the real backends.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._calendars = {}  # name -> (starts, ends, flags, max_duration)
+
+    def list_calendars(self):
+        return list(self._calendars)
+
+    def has_calendar(self, calendar_name):
+        return calendar_name in self._calendars
+
+    def set_events(self, calendar_name, starts, ends, flags=None):
+        """Replace a calendar's events
+
+        Args:
+            starts (sequence): Event starts in epoch seconds
+            ends (sequence): Event ends in epoch seconds, parallel to starts
+            flags (sequence): Optional BusyIntervals flags, parallel to starts
+        """
+        if flags is None:
+            flags = [0] * len(starts)
+        events = sorted(zip(starts, ends, flags))
+        max_duration = max((end_ts - start_ts for start_ts, end_ts, _ in events), default=0)
+        self._calendars[calendar_name] = (
+            array('q', (math.floor(event[0]) for event in events)),
+            array('q', (math.ceil(event[1]) for event in events)),
+            array('B', (event[2] for event in events)),
+            math.ceil(max_duration),
+        )
+        self.invalidate_cache(calendar_name)
+
+    def _fetch_events_for_range(self, calendar_name, span_start, span_end):
+        if calendar_name not in self._calendars:
+            raise CalendarAccessError(f"Calendar '{calendar_name}' not found")
+        starts, ends, flags, max_duration = self._calendars[calendar_name]
+        range_start, range_end = span_start.timestamp(), span_end.timestamp()
+        first = bisect_right(starts, range_start - max_duration - 1)
+        last = bisect_right(starts, range_end)
+        return bucket_intervals_by_day(starts[first:last], ends[first:last], span_start, span_end, flags[first:last])
+
+
+_backend = None
+_backend_lock = threading.Lock()  # The warm-up thread and the UI may ask at once
+
+def get_backend():
+    """Return the process-wide calendar backend
+
+    Uses the ICS file or directory named by MEETING_COORDINATOR_ICS when set,
+    and the macOS Calendar store (EventKit) otherwise. The persistent
+    free/busy index is attached unless MEETING_COORDINATOR_NO_INDEX is set.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            ics_path = os.environ.get('MEETING_COORDINATOR_ICS')
+            if ics_path:
+                from ics_backend import ICSCalendarBackend
+                _backend = ICSCalendarBackend(ics_path)
+            else:
+                try:
+                    from calendar_access import CalendarAccess
+                except ImportError as e:
+                    raise CalendarAccessError(
+                        f"EventKit is not available ({e}). Set MEETING_COORDINATOR_ICS to an .ics file or directory."
+                    )
+                _backend = CalendarAccess.get_instance()
+            if not os.environ.get('MEETING_COORDINATOR_NO_INDEX'):
+                from freebusy_index import FreeBusyIndex
+                try:
+                    _backend.freebusy_index = FreeBusyIndex()
+                except OSError as e:
+                    print(f"Free/busy index unavailable: {str(e)}", file=sys.stderr)
+        return _backend
+
+def set_backend(backend):
+    """Replace the process-wide calendar backend (e.g. with an ICS provider)"""
+    global _backend
+    _backend = backend
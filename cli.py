@@ -0,0 +1,284 @@
+"""Non-interactive command line entry point
+
+Examples:
+    python3 main.py --dates 2025-03-03,2025-03-05 --duration 30 --location London
+    python3 main.py --range 2025-03-03:2025-03-14 --format json
+    python3 main.py --next 5 --calendar Work --calendar Home --format ics
+    python3 main.py --batch queries.jsonl
+
+A batch file holds one JSON query per line, with the same keys as the
+options (calendar, dates, range, next, duration, location, hours) plus an
+optional id. All queries run in one process, so the calendar backend, its
+day cache and the timezone resolver are shared between them.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+
+from config import load_config
+from main import (calendar_exists, find_next_slots, format_multiple_days_email, get_location_timezone,
+                  get_working_days, group_slots_by_date, iter_available_slots, iter_days, CalendarAccessError,
+                  TimezoneLookupError)
+from timezones import is_valid_zone, local_zone_name
+
+FORMATS = ('text', 'json', 'ics')
+
+
+class QueryError(Exception):
+    """Raised when a query is malformed"""
+    pass
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD date into a datetime at midnight"""
+    if not isinstance(value, str):
+        raise QueryError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+    try:
+        return datetime.strptime(value.strip(), '%Y-%m-%d')
+    except ValueError:
+        raise QueryError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+def parse_hours(value):
+    """Parse 'HH:MM-HH:MM' into a working hours dict"""
+    start, sep, end = value.partition('-')
+    try:
+        if not sep:
+            raise ValueError
+        datetime.strptime(start.strip(), '%H:%M')
+        datetime.strptime(end.strip(), '%H:%M')
+    except ValueError:
+        raise QueryError(f"Invalid working hours '{value}', expected HH:MM-HH:MM")
+    return {'start': start.strip(), 'end': end.strip()}
+
+
+def _field(query, key, types, expected):
+    """Return query[key], or None if it is missing, checking its JSON type"""
+    value = query.get(key)
+    # bool is an int subclass, but true is not a duration
+    if value is not None and (not isinstance(value, types) or isinstance(value, bool)):
+        raise QueryError(f"'{key}' must be {expected}")
+    return value
+
+
+def _calendar_names(query):
+    """Return the query's calendars as a list, or None if it names none"""
+    expected = 'a calendar name or a list of them'
+    value = _field(query, 'calendar', (str, list), expected)
+    if isinstance(value, str):
+        return [value]
+    if value is not None and not all(isinstance(item, str) for item in value):
+        raise QueryError(f"'calendar' must be {expected}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='meeting-coordinator',
+        description='Find available meeting slots. Runs interactively when no options are given.'
+    )
+    parser.add_argument('--calendar', action='append',
+                        help='Calendar to check; repeat to require all of them to be free '
+                             '(default: the configured calendar)')
+    when = parser.add_mutually_exclusive_group()
+    when.add_argument('--dates', help='Comma-separated dates, YYYY-MM-DD')
+    when.add_argument('--range', help='Date range START:END (inclusive), working days only')
+    when.add_argument('--next', type=int, metavar='N', help='Find the next N available slots from tomorrow')
+    parser.add_argument('--duration', type=int, default=60, help='Meeting duration in minutes (default: 60)')
+    parser.add_argument('--location', help="Location or IANA timezone to show slots in (default: local time)")
+    parser.add_argument('--hours', help='Working hours HH:MM-HH:MM (default: the configured hours)')
+    parser.add_argument('--format', choices=FORMATS, default='text', help='Output format (default: text)')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Answer the JSONL queries in FILE ('-' for stdin), one result per query")
+    return parser
+
+
+def query_from_args(args):
+    """Turn parsed options into a query dict, as found in a batch file"""
+    return {
+        'calendar': args.calendar,
+        'dates': args.dates,
+        'range': args.range,
+        'next': args.next,
+        'duration': args.duration,
+        'location': args.location,
+        'hours': args.hours,
+    }
+
+
+def run_query(query, config):
+    """Answer one query
+
+    Args:
+        query (dict): Query keys as accepted in a batch file
+        config (dict): Loaded configuration, for defaults
+
+    Returns:
+        tuple: (timezone, dict mapping each date to its slots)
+
+    Raises:
+        QueryError: If the query is malformed, including fields of the wrong type
+        CalendarAccessError: If a calendar does not exist or cannot be read
+        TimezoneLookupError: If the location cannot be resolved
+    """
+    calendars = _calendar_names(query) or config.get('selected_calendar')
+    if not calendars:
+        raise QueryError("No calendar given and none configured")
+    if isinstance(calendars, str):
+        calendars = [calendars]
+    for calendar_name in calendars:
+        if not calendar_exists(calendar_name):
+            raise CalendarAccessError(f"Calendar '{calendar_name}' not found")
+    if len(calendars) == 1:
+        calendars = calendars[0]
+
+    duration = _field(query, 'duration', int, 'a positive number of minutes')
+    if duration is None:
+        duration = 60
+    elif duration <= 0:
+        raise QueryError("Duration must be a positive number of minutes")
+
+    hours = _field(query, 'hours', str, 'working hours HH:MM-HH:MM')
+    working_hours = parse_hours(hours) if hours else config['working_hours']
+    working_days = get_working_days(config)
+
+    target_tz = None
+    location = _field(query, 'location', str, 'a place or timezone name')
+    if location:
+        target_tz = location if is_valid_zone(location) else get_location_timezone(location)
+        if not target_tz:
+            raise TimezoneLookupError(f"Could not determine timezone for '{location}'")
+
+    slot_count = _field(query, 'next', int, 'a positive number of slots')
+    date_range = _field(query, 'range', str, 'a range START:END')
+    dates = _field(query, 'dates', (str, list), 'comma-separated dates or a list of them')
+    if isinstance(dates, str):
+        dates = dates.split(',')
+
+    if slot_count is not None:
+        if slot_count <= 0:
+            raise QueryError("The number of next slots must be positive")
+        next_slots = find_next_slots(calendars, slot_count, working_hours, duration, target_tz,
+                                     working_days=working_days)
+        return target_tz, group_slots_by_date(next_slots)
+
+    if date_range:
+        start, sep, end = date_range.partition(':')
+        if not sep:
+            raise QueryError(f"Invalid range '{date_range}', expected START:END")
+        target_dates = [day for day in iter_days(parse_date(start), parse_date(end))
+                        if day.weekday() in working_days]
+    elif dates:
+        target_dates = sorted({parse_date(value) for value in dates})
+    else:
+        raise QueryError("Give dates, a range or a number of next slots")
+
+    all_slots = {target_date.date(): [] for target_date in target_dates}
+    for day, slot in iter_available_slots(calendars, target_dates, working_hours, duration, target_tz):
+        all_slots[day].append(slot)
+    return target_tz, all_slots
+
+
+def format_json(all_slots, target_tz, query_id=None):
+    """Serialize slots as a JSON object with ISO 8601 times"""
+    result = {'timezone': target_tz or local_zone_name(), 'slots': {
+        day.isoformat(): [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in slots]
+        for day, slots in sorted(all_slots.items())
+    }}
+    if query_id is not None:
+        result = {'id': query_id, **result}
+    return json.dumps(result)
+
+
+def format_ics(all_slots):
+    """Serialize slots as an iCalendar feed of free (transparent) events"""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Meeting Coordinator//Availability//EN']
+    for day, slots in sorted(all_slots.items()):
+        for start, end in slots:
+            start_utc = start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+            end_utc = end.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+            lines += [
+                'BEGIN:VEVENT',
+                f'UID:{start_utc}-{end_utc}@meeting-coordinator',
+                f'DTSTAMP:{stamp}',
+                f'DTSTART:{start_utc}',
+                f'DTEND:{end_utc}',
+                'SUMMARY:Available',
+                'TRANSP:TRANSPARENT',
+                'END:VEVENT',
+            ]
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def format_result(all_slots, target_tz, output_format, query_id=None):
+    if output_format == 'json':
+        return format_json(all_slots, target_tz, query_id)
+    if output_format == 'ics':
+        return format_ics(all_slots)
+    return format_multiple_days_email(all_slots, target_tz)
+
+
+def run_batch(path, output_format, config, defaults):
+    """Answer every query of a JSONL file; a failed query does not stop the rest
+
+    Returns:
+        int: Number of queries that failed
+    """
+    failures = 0
+    stream = sys.stdin if path == '-' else open(path, 'r')
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            query_id = line_number
+            try:
+                query = json.loads(line)
+                if not isinstance(query, dict):
+                    raise QueryError("Query must be a JSON object")
+                query_id = query.get('id', line_number)
+                merged = {**defaults, **{k: v for k, v in query.items() if v is not None}}
+                target_tz, all_slots = run_query(merged, config)
+                output = format_result(all_slots, target_tz, output_format, query_id)
+            except (ValueError, QueryError, TimezoneLookupError, CalendarAccessError) as e:
+                failures += 1
+                if output_format == 'json':
+                    output = json.dumps({'id': query_id, 'error': str(e)})
+                else:
+                    print(f"Query {query_id}: {e}", file=sys.stderr)
+                    continue
+            if output_format == 'text':
+                output = f"== {query_id} ==\n{output}\n"
+            print(output, end='' if output_format == 'ics' else '\n', flush=True)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return failures
+
+
+def run(argv):
+    """Run the command line interface
+
+    Returns:
+        int: Process exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    config = load_config()
+
+    try:
+        if args.batch:
+            # Options given alongside --batch act as defaults for every query
+            defaults = {k: v for k, v in query_from_args(args).items() if v is not None}
+            return 1 if run_batch(args.batch, args.format, config, defaults) else 0
+
+        target_tz, all_slots = run_query(query_from_args(args), config)
+        print(format_result(all_slots, target_tz, args.format), end='' if args.format == 'ics' else '\n')
+        return 0
+    except QueryError as e:
+        parser.error(str(e))
+    except (TimezoneLookupError, CalendarAccessError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
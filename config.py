@@ -1,6 +1,11 @@
 # config.py
+import atexit
+import copy
 import os
 import json
+import sys
+import tempfile
+import threading
 from datetime import datetime 
 
 DEFAULT_CONFIG = {
@@ -9,31 +14,105 @@ DEFAULT_CONFIG = {
         'start': '11:00',
         'end': '19:00'
     },
+    'working_days': [0, 1, 2, 3, 4],  # Monday=0 ... Sunday=6
     'last_location': ''
 }
 
 CONFIG_FILE = os.path.expanduser('~/.meeting_coordinator_config.json')
+SAVE_DELAY = 0.5  # Seconds to wait for more changes before writing
+
+
+class ConfigStore:
+    """In-memory configuration backed by CONFIG_FILE
+
+    The parsed file is kept in memory and re-read only when its mtime or
+    size changes. Saves update memory at once and are written to disk after
+    SAVE_DELAY, so a burst of saves costs a single write; the write goes to
+    a temporary file that is renamed over the config, so readers never see
+    a partial file. Pending changes are flushed at exit.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Singleton pattern so the GUI and CLI share one copy of the config"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=CONFIG_FILE, save_delay=SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self._config = None
+        self._signature = None  # (mtime_ns, size) of the file behind _config
+        self._pending = False
+        self._timer = None
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """Return a copy of the configuration, re-reading the file only if it changed"""
+        with self._lock:
+            if not self._pending:
+                signature = self._file_signature()
+                if self._config is None or signature != self._signature:
+                    self._config = self._read(signature)
+                    self._signature = signature
+            return copy.deepcopy(self._config)
+
+    def _read(self, signature):
+        if signature is None:
+            print("Config file not found, using default", file=sys.stderr)
+            print(f"Debug - Trying to load from: {os.path.abspath(self.path)}", file=sys.stderr)
+            return copy.deepcopy(DEFAULT_CONFIG)
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def save(self, config):
+        """Replace the configuration; the file is written shortly after"""
+        with self._lock:
+            self._config = copy.deepcopy(config)
+            self._pending = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending changes now, atomically"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            directory = os.path.dirname(self.path) or '.'
+            fd, temp_path = tempfile.mkstemp(prefix='.meeting_coordinator_config.', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self._config, f, indent=2)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self._pending = False
+            self._signature = self._file_signature()
+
 
 def load_config():
     """Load configuration from file or create default if it doesn't exist"""
-    try:
-        # Force clear any OS file caching
-        if os.path.exists(CONFIG_FILE):
-            os.fsync(os.open(CONFIG_FILE, os.O_RDONLY))
-            
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-            # print(f"Loaded config from file: {config}")
-            return config
-    except FileNotFoundError:
-        print("Config file not found, using default")
-        print(f"Debug - Trying to load from: {os.path.abspath(CONFIG_FILE)}")
-        return DEFAULT_CONFIG.copy()
+    return ConfigStore.get_instance().load()
 
 def save_config(config):
-    """Save configuration to file"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    """Save configuration to file (debounced; see ConfigStore)"""
+    ConfigStore.get_instance().save(config)
 
 def setup_initial_config(calendars):
     """Interactive configuration setup"""
@@ -0,0 +1,298 @@
+"""Persistent free/busy index
+
+Keeps what is known about each calendar's busy time between runs, so a cold
+start can answer the coming weeks without querying the calendar at all.
+
+Each calendar has one file of fixed-size records, one per UTC day
+(epoch minute // 1440). A record is two 1440-bit bitmaps, the minutes whose
+state is known and the minutes that are busy, followed by the time the
+record was written. 90 days take 33 KB. Files are read through mmap and
+written in place, record by record.
+
+Days are written as they are fetched and dropped through the backend's
+invalidation hooks: whole calendars on a store change, and only the
+affected days when an ICS file diff is available. A small JSON file next to
+the bitmaps records the source signature (the ICS file's mtime and size, or
+the macOS Calendar database's); a mismatch discards the calendar's index.
+With a signature, the index answers cold starts for as long as the source
+is unchanged, and any change to it, even one made while the app was closed,
+is caught.
+
+Sources without a signature cannot tell the index about changes made while
+the app was not running. Their days are trusted for UNSIGNED_MAX_AGE after
+being written, which is the trade-off: changes made elsewhere can be served
+stale for up to that long, and days older than that are fetched again
+rather than served from the index.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
+
+from calendar_backend import BusyIntervals
+
+FREEBUSY_DIR = os.path.expanduser('~/.meeting_coordinator_freebusy')
+
+MINUTES_PER_DAY = 1440
+BITMAP_BYTES = MINUTES_PER_DAY // 8
+WRITTEN_AT = struct.Struct('<q')  # Epoch seconds the record was written
+RECORD_BYTES = 2 * BITMAP_BYTES + WRITTEN_AT.size  # known bitmap, busy bitmap, written at
+HEADER = struct.Struct('<4sxxxxq')  # magic, base day
+MAGIC = b'FBI2'
+BASE_MARGIN_DAYS = 366  # New files start a year back so earlier days rarely force a rebase
+UNSIGNED_MAX_AGE = 3600  # Seconds a day of a source without a signature is trusted
+FULL_DAY = (1 << MINUTES_PER_DAY) - 1
+
+
+def _minute_mask(first, last):
+    """Bit mask of minutes [first, last) within a day"""
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def _runs(bits, offset):
+    """Yield (start, end) of the runs of set bits, shifted by offset"""
+    position = 0
+    while bits:
+        gap = (bits & -bits).bit_length() - 1
+        bits >>= gap
+        position += gap
+        length = (bits ^ (bits + 1)).bit_length() - 1
+        yield offset + position, offset + position + length
+        bits >>= length
+        position += length
+
+
+class _BitmapFile:
+    """Day records of one calendar in one memory-mapped file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.base_day = None
+        self._file = None
+        self._map = None
+        if os.path.exists(path):
+            self._open()
+
+    def _open(self):
+        self._file = open(self.path, 'r+b')
+        magic, base_day = HEADER.unpack(self._file.read(HEADER.size).ljust(HEADER.size, b'\0'))
+        if magic != MAGIC:
+            self.close()
+            os.remove(self.path)
+            return
+        self.base_day = base_day
+        self._remap()
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        size = os.fstat(self._file.fileno()).st_size
+        if size > HEADER.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _create(self, base_day):
+        self.close()
+        self._file = open(self.path, 'w+b')
+        self._file.write(HEADER.pack(MAGIC, base_day))
+        self._file.flush()
+        self.base_day = base_day
+
+    def read(self, utc_day):
+        """Return (known, busy, written_at) of a UTC day; the bitmaps as ints"""
+        if self._map is None or utc_day < self.base_day:
+            return 0, 0, 0
+        offset = HEADER.size + (utc_day - self.base_day) * RECORD_BYTES
+        if offset + RECORD_BYTES > len(self._map):
+            return 0, 0, 0
+        record = self._map[offset:offset + RECORD_BYTES]
+        return (int.from_bytes(record[:BITMAP_BYTES], 'little'),
+                int.from_bytes(record[BITMAP_BYTES:2 * BITMAP_BYTES], 'little'),
+                WRITTEN_AT.unpack_from(record, 2 * BITMAP_BYTES)[0])
+
+    def write(self, utc_day, known, busy, written_at):
+        if self.base_day is None:
+            self._create(utc_day - BASE_MARGIN_DAYS)
+        elif utc_day < self.base_day:
+            # Rare: start a new file further back rather than shifting records
+            self._create(utc_day - BASE_MARGIN_DAYS)
+        offset = HEADER.size + (utc_day - self.base_day) * RECORD_BYTES
+        record = (known.to_bytes(BITMAP_BYTES, 'little') + busy.to_bytes(BITMAP_BYTES, 'little')
+                  + WRITTEN_AT.pack(written_at))
+        os.pwrite(self._file.fileno(), record, offset)
+        if self._map is None or offset + RECORD_BYTES > len(self._map):
+            self._remap()
+
+    def clear(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.base_day = None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FreeBusyIndex:
+    """Per-calendar, per-UTC-day busy bitmaps persisted in a cache directory"""
+
+    def __init__(self, directory=FREEBUSY_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._files = {}  # calendar name -> _BitmapFile
+        self._meta = {}  # calendar name -> {'signature': ...}
+        self._lock = threading.Lock()
+
+    def _paths(self, calendar_name):
+        key = hashlib.sha1(calendar_name.encode('utf-8')).hexdigest()[:16]
+        base = os.path.join(self.directory, key)
+        return base + '.fbi', base + '.json'
+
+    def _write_meta(self, calendar_name, meta):
+        _, meta_path = self._paths(calendar_name)
+        temp_path = meta_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'calendar': calendar_name, **meta}, f)
+        os.replace(temp_path, meta_path)
+        self._meta[calendar_name] = meta
+
+    def _get_file(self, calendar_name, signature):
+        """Open a calendar's bitmaps, discarding them if the source changed"""
+        bitmaps = self._files.get(calendar_name)
+        if bitmaps is None:
+            data_path, meta_path = self._paths(calendar_name)
+            try:
+                with open(meta_path, 'r') as f:
+                    stored = json.load(f)
+                self._meta[calendar_name] = {'signature': stored.get('signature')}
+            except (OSError, ValueError):
+                self._meta[calendar_name] = {'signature': None}
+            bitmaps = self._files[calendar_name] = _BitmapFile(data_path)
+
+        if self._meta[calendar_name]['signature'] != signature:
+            bitmaps.clear()
+            self._write_meta(calendar_name, {'signature': signature})
+        return bitmaps
+
+    def _trusted_since(self, signature):
+        """Oldest write time still trusted; signed sources are trusted until their signature changes"""
+        return 0 if signature is not None else time.time() - UNSIGNED_MAX_AGE
+
+    def read_days(self, calendar_name, days, signature=None):
+        """Answer local days entirely from the index
+
+        Args:
+            calendar_name (str): Calendar to read
+            days (list): Local dates to look up
+            signature: Current source signature, or None if the source has none
+
+        Returns:
+            dict: Maps each fully known day to a BusyIntervals of its busy
+                minutes; days with any unknown minute are left out
+        """
+        result = {}
+        trusted_since = self._trusted_since(signature)
+        with self._lock:
+            bitmaps = self._get_file(calendar_name, signature)
+            if bitmaps.base_day is None:
+                return result
+            for day in days:
+                first = int(datetime.combine(day, datetime.min.time()).timestamp()) // 60
+                last = int(datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()) // 60
+                first_day, last_day = first // MINUTES_PER_DAY, (last - 1) // MINUTES_PER_DAY
+                known = busy = 0
+                for index, utc_day in enumerate(range(first_day, last_day + 1)):
+                    day_known, day_busy, written_at = bitmaps.read(utc_day)
+                    if written_at < trusted_since:
+                        continue
+                    known |= day_known << (index * MINUTES_PER_DAY)
+                    busy |= day_busy << (index * MINUTES_PER_DAY)
+                shift = first - first_day * MINUTES_PER_DAY
+                span = (1 << (last - first)) - 1
+                if (known >> shift) & span != span:
+                    continue
+                intervals = BusyIntervals()
+                for start, end in _runs((busy >> shift) & span, first):
+                    intervals.append(start * 60, end * 60)
+                result[day] = intervals
+        return result
+
+    def write_span(self, calendar_name, span_start, span_end, events_by_day, signature=None):
+        """Record the busy minutes of a fetched span
+
+        Args:
+            span_start (datetime): Start of the fetched span
+            span_end (datetime): End of the fetched span (23:59:59 of the last day)
+            events_by_day (dict): The fetch result, date -> BusyIntervals
+        """
+        known_first = -(-int(span_start.timestamp()) // 60)
+        known_last = (int(span_end.timestamp()) + 1) // 60
+        if known_last <= known_first:
+            return
+
+        # Busy minutes of the span per UTC day; multi-day events are listed
+        # under several dates but setting a bit twice is harmless
+        first_day, last_day = known_first // MINUTES_PER_DAY, (known_last - 1) // MINUTES_PER_DAY
+        busy_by_day = {}
+        for intervals in events_by_day.values():
+            for start_ts, end_ts in zip(*intervals.timed_columns()):
+                start = max(start_ts // 60, known_first)
+                end = min(-(-end_ts // 60), known_last)
+                for utc_day in range(max(start // MINUTES_PER_DAY, first_day),
+                                     min((end - 1) // MINUTES_PER_DAY, last_day) + 1):
+                    origin = utc_day * MINUTES_PER_DAY
+                    busy_by_day[utc_day] = busy_by_day.get(utc_day, 0) | _minute_mask(
+                        max(start - origin, 0), min(end - origin, MINUTES_PER_DAY)
+                    )
+
+        now = int(time.time())
+        trusted_since = self._trusted_since(signature)
+        with self._lock:
+            bitmaps = self._get_file(calendar_name, signature)
+            for utc_day in range(first_day, last_day + 1):
+                origin = utc_day * MINUTES_PER_DAY
+                new_known = _minute_mask(max(known_first - origin, 0), min(known_last - origin, MINUTES_PER_DAY))
+                known, busy, written_at = bitmaps.read(utc_day)
+                if written_at < trusted_since:
+                    # The rest of the day is too old to carry over under a new write time
+                    known = busy = 0
+                busy = (busy & ~new_known & FULL_DAY) | (busy_by_day.get(utc_day, 0) & new_known)
+                bitmaps.write(utc_day, known | new_known, busy, now)
+
+    def invalidate(self, calendar_name=None):
+        """Forget everything about one calendar, or all of them"""
+        with self._lock:
+            names = list(self._files) if calendar_name is None else [calendar_name]
+            for name in names:
+                bitmaps = self._files.get(name) or _BitmapFile(self._paths(name)[0])
+                bitmaps.clear()
+            if calendar_name is None:
+                for name in os.listdir(self.directory):
+                    if name.endswith('.fbi'):
+                        os.remove(os.path.join(self.directory, name))
+
+    def invalidate_range(self, calendar_name, start_ts, end_ts):
+        """Forget the UTC days touching [start_ts, end_ts], e.g. around a changed event"""
+        with self._lock:
+            bitmaps = self._files.get(calendar_name)
+            if bitmaps is None or bitmaps.base_day is None:
+                return
+            for utc_day in range(int(start_ts) // 60 // MINUTES_PER_DAY, int(end_ts) // 60 // MINUTES_PER_DAY + 1):
+                if bitmaps.read(utc_day)[0]:
+                    bitmaps.write(utc_day, 0, 0, 0)
+
+    def set_signature(self, calendar_name, signature):
+        """Record that the index matches a new source signature"""
+        with self._lock:
+            self._write_meta(calendar_name, {'signature': signature})
@@ -0,0 +1,116 @@
+"""Offline location to timezone resolution
+
+Matches city names, country names, IANA zone names and common abbreviations
+("PST", "CET") against a bundled, pre-sorted index (resources/gazetteer.tsv)
+so most lookups need no network at all. Each index row is
+
+    name <TAB> kind <TAB> timezone <TAB> country code <TAB> region code
+
+where kind is city, country, abbrev, or region. Region rows (US states,
+Canadian provinces, ...) carry no timezone; they only narrow down which
+place a qualified query such as "Portland, OR" refers to. Cities in
+countries with region rows carry their ISO 3166-2 region code ("US-OR"), so
+a region qualifier only matches cities in that region; other rows, and
+region rows that are just another name for a country ("usa"), leave it
+empty.
+"""
+import os
+import sys
+import zoneinfo
+from bisect import bisect_left
+
+from geocache import normalize_location
+
+GAZETTEER_FILE = os.path.join(os.path.dirname(__file__), 'resources', 'gazetteer.tsv')
+
+# Preferred match when a bare name is both, e.g. a city and an abbreviation
+KIND_PRIORITY = {'city': 0, 'country': 1, 'abbrev': 2}
+
+
+class Gazetteer:
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Singleton pattern so the index is loaded once per process"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=GAZETTEER_FILE):
+        self.path = path
+        self._names = None  # Sorted names, parallel to _rows
+        self._rows = None   # (kind, timezone, country, region) tuples
+        self._zones = None  # Lower-cased IANA name -> canonical IANA name
+
+    def _load(self):
+        names = []
+        rows = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('#') or not line.strip():
+                        continue
+                    name, kind, tz, country, region = line.rstrip('\n').split('\t')
+                    names.append(name)
+                    rows.append((kind, tz, country, region))
+        except OSError as e:
+            print(f"Gazetteer unavailable: {e}", file=sys.stderr)
+        self._zones = {zone.lower(): zone for zone in zoneinfo.available_timezones()}
+        self._rows = rows
+        self._names = names
+
+    def _lookup(self, name):
+        """Return all index rows for an exact name"""
+        if self._names is None:
+            self._load()
+        i = bisect_left(self._names, name)
+        matches = []
+        while i < len(self._names) and self._names[i] == name:
+            matches.append(self._rows[i])
+            i += 1
+        return matches
+
+    def _places(self, qualifier):
+        """(country, region) codes a qualifier such as 'uk' or 'tx' refers to; region is '' for a whole country"""
+        return {
+            (country, region) for kind, _, country, region in self._lookup(qualifier)
+            if kind in ('country', 'region')
+        }
+
+    def resolve(self, location):
+        """Resolve a location to an IANA timezone name without the network
+
+        Returns:
+            str: The timezone, or None if the location is unknown or ambiguous
+        """
+        key = normalize_location(location)
+        if not key:
+            return None
+
+        self._lookup('')  # Ensure the index is loaded
+        zone = self._zones.get(key.replace(' ', '_'))
+        if zone and '/' in zone:
+            return zone
+
+        name, *qualifiers = key.split(', ')
+        candidates = sorted(
+            (row for row in self._lookup(name) if row[1]),
+            key=lambda row: KIND_PRIORITY.get(row[0], len(KIND_PRIORITY))
+        )
+        for qualifier in qualifiers:
+            places = self._places(qualifier)
+            if not places:
+                # Unknown qualifier such as a county or district; let the geocoder decide
+                return None
+            candidates = [row for row in candidates if (row[2], '') in places or (row[2], row[3]) in places]
+
+        if not candidates:
+            # Legacy zone names such as 'Japan' or 'EST5EDT'; a qualified name
+            # we have no row for (e.g. "Springfield, IL") is left to the geocoder
+            return zone if not qualifiers else None
+        best = KIND_PRIORITY.get(candidates[0][0], len(KIND_PRIORITY))
+        if len({row[1] for row in candidates if KIND_PRIORITY.get(row[0], len(KIND_PRIORITY)) == best}) > 1:
+            # E.g. a bare "Portland"; let the geocoder decide
+            return None
+        return candidates[0][1]
@@ -0,0 +1,131 @@
+"""Persistent cache of geocoding results
+
+Maps a normalized location string to (latitude, longitude, timezone) in a
+small SQLite database, fronted by an in-memory LRU so repeated lookups never
+touch the disk or the network. Failed lookups are cached too (for a shorter
+time) so typos don't trigger a round trip on every click.
+"""
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+GEOCACHE_FILE = os.path.expanduser('~/.meeting_coordinator_geocache.sqlite')
+
+DEFAULT_TTL = 90 * 24 * 3600  # Cities rarely move
+NEGATIVE_TTL = 24 * 3600
+MAX_ENTRIES = 1000
+
+# Returned by GeocodeCache.get when the location has no usable entry
+MISS = object()
+
+
+def normalize_location(location):
+    """Normalize a location string for use as a cache key
+
+    'London,UK', ' london ,  uk ' and 'London, UK' share one entry.
+    """
+    location = re.sub(r'\s*,\s*', ', ', location.strip().lower())
+    return re.sub(r'\s+', ' ', location)
+
+
+class GeocodeCache:
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Singleton pattern so the GUI and CLI share one cache"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path=GEOCACHE_FILE, ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._memory = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocache ("
+                " location TEXT PRIMARY KEY,"
+                " lat REAL, lng REAL, tz TEXT,"
+                " expires_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS geocache_last_used ON geocache (last_used)")
+        return self._db
+
+    def _remember(self, key, expires_at, result):
+        self._memory[key] = (expires_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, location):
+        """Look up a location
+
+        Returns:
+            (lat, lng, tz) for a cached hit, None for a cached failed lookup,
+            or MISS if the location must be geocoded.
+        """
+        key = normalize_location(location)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+            try:
+                db = self._connect()
+                row = db.execute(
+                    "SELECT lat, lng, tz, expires_at FROM geocache WHERE location = ?", (key,)
+                ).fetchone()
+                if row is None or row[3] <= now:
+                    return MISS
+                db.execute("UPDATE geocache SET last_used = ? WHERE location = ?", (now, key))
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"Geocode cache unavailable: {e}", file=sys.stderr)
+                return MISS
+
+            result = None if row[2] is None else (row[0], row[1], row[2])
+            self._remember(key, row[3], result)
+            return result
+
+    def put(self, location, result):
+        """Store a lookup result; pass None to record a failed lookup"""
+        key = normalize_location(location)
+        now = time.time()
+        expires_at = now + (self.ttl if result is not None else self.negative_ttl)
+        lat, lng, tz = result if result is not None else (None, None, None)
+        with self._lock:
+            self._remember(key, expires_at, result)
+            try:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO geocache (location, lat, lng, tz, expires_at, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, lat, lng, tz, expires_at, now)
+                )
+                # Evict expired entries, then the least recently used beyond the limit
+                db.execute("DELETE FROM geocache WHERE expires_at <= ?", (now,))
+                db.execute(
+                    "DELETE FROM geocache WHERE location NOT IN"
+                    " (SELECT location FROM geocache ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"Geocode cache unavailable: {e}", file=sys.stderr)
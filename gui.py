@@ -2,20 +2,23 @@ import sys
 import os
 import json
 import re
-import time
+import threading
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QSystemTrayIcon, 
     QMenu, QAction, QHBoxLayout, QLabel, QLineEdit, 
     QPushButton, QTextEdit, QSpinBox, QDateEdit, 
     QComboBox, QMessageBox, QGroupBox, QGridLayout, QCheckBox, QSizePolicy
 )
-from PyQt5.QtCore import Qt, QDate, QTimer
+from PyQt5.QtCore import Qt, QDate, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor
 from datetime import datetime, timedelta
 from config import load_config, setup_initial_config
-import pytz
-from main import (list_calendars, get_available_slots, format_multiple_days_email, get_location_timezone,
-                 CalendarAccessError)
+from main import (list_calendars, calendar_exists, collect_available_slots, format_multiple_days_email,
+                 find_next_slots, get_location_timezone, get_working_days, group_slots_by_date, prefetch_events,
+                 CalendarAccessError, TimezoneLookupError)
+from calendar_backend import get_backend
+from timezone_resolver import TimezoneResolver
+from tracing import span
 
 
 class SettingsWindow(QWidget):
@@ -201,6 +204,30 @@ QMenu::item:selected {
 }
 """
 
+class WarmUpSignals(QObject):
+    finished = pyqtSignal()
+
+
+class WarmUpWorker(QRunnable):
+    """Loads the calendar store, timezone data and upcoming events off the UI thread"""
+
+    def __init__(self):
+        super().__init__()
+        self.signals = WarmUpSignals()
+
+    def run(self):
+        try:
+            TimezoneResolver.get_instance().warm_up()
+            get_backend()  # Imports EventKit and opens the event store
+            selected_calendar = load_config().get('selected_calendar')
+            if selected_calendar:
+                # Fill the free/busy index for the coming weeks while the app sits idle
+                prefetch_events(selected_calendar)
+        except Exception as e:
+            print(f"Warm-up failed: {str(e)}")
+        self.signals.finished.emit()
+
+
 class MeetingCoordinatorMenu(QSystemTrayIcon):
     def setup_window(self):
         self.window = CheckAvailabilityWindow()
@@ -231,13 +258,26 @@ class MeetingCoordinatorMenu(QSystemTrayIcon):
             self.setIcon(QIcon(icon_pixmap))
         
         self.setup_menu()
-        self.setup_window()
         self.show()
+        
+        # Show the icon first; the window is built once the warm-up is done
+        self.warm_up_worker = None
+        QTimer.singleShot(0, self.start_warm_up)
+
+    def start_warm_up(self):
+        self.warm_up_worker = WarmUpWorker()
+        self.warm_up_worker.signals.finished.connect(self.on_warm_up_finished)
+        QThreadPool.globalInstance().start(self.warm_up_worker)
+
+    def on_warm_up_finished(self):
+        self.warm_up_worker = None
+        if self.window is None:
+            self.setup_window()
 
     def refresh_config(self):
         self.config = load_config()
         print(f"Menu refreshed with config: {self.config}")
-        if hasattr(self, 'window'):
+        if self.window is not None:
             self.window.refresh_config()
 
     def setup_menu(self):
@@ -285,8 +325,8 @@ class MeetingCoordinatorMenu(QSystemTrayIcon):
 
     def show_window(self):
         # Create new window instance if needed
-        if not hasattr(self, 'window') or not self.window:
-            self.window = CheckAvailabilityWindow()
+        if self.window is None:
+            self.setup_window()
         
         geometry = self.geometry()
         window_x = geometry.x() - (self.window.width() // 2)
@@ -320,6 +360,91 @@ class MeetingCoordinatorMenu(QSystemTrayIcon):
         self.window.raise_()
         self.window.activateWindow()
 
+class AvailabilityWorkerSignals(QObject):
+    """Signals emitted by AvailabilityWorker; delivered on the UI thread"""
+    progress = pyqtSignal(int, int, int)              # generation, dates done, dates total
+    day_ready = pyqtSignal(int, object, object, object)  # generation, date, slots, timezone
+    finished = pyqtSignal(int, object, object)        # generation, all slots, timezone
+    failed = pyqtSignal(int, str)                     # generation, message
+
+
+class AvailabilityWorker(QRunnable):
+    """Geocodes, queries the calendar and computes slots off the UI thread"""
+
+    def __init__(self, generation, calendar_name, dates, working_hours, duration, location,
+                 next_count=None, working_days=None):
+        super().__init__()
+        self.generation = generation
+        self.calendar_name = calendar_name
+        self.dates = dates
+        self.working_hours = working_hours
+        self.duration = duration
+        self.location = location
+        self.next_count = next_count  # Search for the next N slots instead of checking dates
+        self.working_days = working_days
+        self.signals = AvailabilityWorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        if self.next_count:
+            self.run_next_search()
+            return
+        try:
+            dates_done = []
+            
+            def on_day(date, slots, timezone_str):
+                dates_done.append(date)
+                self.signals.day_ready.emit(self.generation, date, slots, timezone_str)
+                self.signals.progress.emit(self.generation, len(dates_done), len(self.dates))
+            
+            # Geocoding runs alongside the concurrent per-date calendar fetches
+            with span('check.total', days=len(self.dates)):
+                result = collect_available_slots(
+                    self.calendar_name,
+                    self.dates,
+                    self.working_hours,
+                    self.duration,
+                    location=self.location,
+                    on_day=on_day,
+                    is_cancelled=self.is_cancelled
+                )
+            if result is not None and not self.is_cancelled():
+                timezone_str, all_available_slots = result
+                self.signals.finished.emit(self.generation, all_available_slots, timezone_str)
+        except TimezoneLookupError as e:
+            self.signals.failed.emit(self.generation, str(e))
+        except Exception as e:
+            self.signals.failed.emit(self.generation, f"An error occurred: {str(e)}")
+
+    def run_next_search(self):
+        """Find the next available slots, looking further ahead until enough are found"""
+        try:
+            timezone_str = None
+            if self.location:
+                timezone_str = get_location_timezone(self.location)
+                if not timezone_str:
+                    raise TimezoneLookupError("Could not determine timezone for the given location.")
+            next_slots = find_next_slots(
+                self.calendar_name,
+                self.next_count,
+                self.working_hours,
+                self.duration,
+                timezone_str,
+                working_days=self.working_days
+            )
+            if not self.is_cancelled():
+                self.signals.finished.emit(self.generation, group_slots_by_date(next_slots), timezone_str)
+        except TimezoneLookupError as e:
+            self.signals.failed.emit(self.generation, str(e))
+        except Exception as e:
+            self.signals.failed.emit(self.generation, f"An error occurred: {str(e)}")
+
 class CheckAvailabilityWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -331,6 +456,11 @@ class CheckAvailabilityWindow(QWidget):
         self.config = load_config()
         self.available_calendars = list_calendars()
         self.date_widgets = []
+        
+        # Background availability check state
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_worker = None
+        self.check_generation = 0
 
         # Working hours state
         self.temp_working_hours = None  # Will store temporary override
@@ -450,6 +580,19 @@ class CheckAvailabilityWindow(QWidget):
         self.dates_layout.setSpacing(10)
         layout.addWidget(self.dates_group)
         
+        # Next available slots search, in place of specific dates
+        next_layout = QHBoxLayout()
+        self.next_slots_checkbox = QCheckBox("Find the next available slots:")
+        self.next_slots_checkbox.toggled.connect(self.on_next_slots_toggled)
+        self.next_slots_input = QSpinBox()
+        self.next_slots_input.setRange(1, 20)
+        self.next_slots_input.setValue(3)
+        self.next_slots_input.setMinimumHeight(32)
+        self.next_slots_input.setEnabled(False)
+        next_layout.addWidget(self.next_slots_checkbox)
+        next_layout.addWidget(self.next_slots_input)
+        layout.addLayout(next_layout)
+        
         # Duration input
         duration_layout = QHBoxLayout()
         duration_label = QLabel("Duration (minutes):")
@@ -473,6 +616,10 @@ class CheckAvailabilityWindow(QWidget):
         check_button.clicked.connect(self.check_availability)
         layout.addWidget(check_button)
         
+        # Progress of the running check
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        
         # Results area
         results_group = QGroupBox("Results")
         results_layout = QVBoxLayout()
@@ -490,8 +637,22 @@ class CheckAvailabilityWindow(QWidget):
         copy_button.clicked.connect(self.copy_to_clipboard)
         layout.addWidget(copy_button)
         
+        # Any input change makes a running check stale
+        self.calendar_combo.currentIndexChanged.connect(self.cancel_check)
+        self.temp_start_time.textChanged.connect(self.cancel_check)
+        self.temp_end_time.textChanged.connect(self.cancel_check)
+        self.duration_input.valueChanged.connect(self.cancel_check)
+        self.location_input.textChanged.connect(self.cancel_check)
+        self.next_slots_input.valueChanged.connect(self.cancel_check)
+        
         self.setMinimumWidth(400)
 
+    def on_next_slots_toggled(self, checked):
+        """Switch between checking specific dates and searching ahead"""
+        self.cancel_check()
+        self.dates_group.setEnabled(not checked)
+        self.next_slots_input.setEnabled(checked)
+
     def add_date_field(self):
         date_row = QHBoxLayout()
         
@@ -501,6 +662,7 @@ class CheckAvailabilityWindow(QWidget):
         date_edit.setMinimumDate(QDate.currentDate())
         date_edit.setMinimumHeight(32)
         self.date_widgets.append(date_edit)
+        date_edit.dateChanged.connect(self.cancel_check)
         
         remove_button = QPushButton("×")
         remove_button.setMaximumWidth(30)
@@ -514,6 +676,7 @@ class CheckAvailabilityWindow(QWidget):
 
     def remove_date_field(self, date_row, date_edit):
         if len(self.date_widgets) > 1:
+            self.cancel_check()
             self.date_widgets.remove(date_edit)
             while date_row.count():
                 item = date_row.takeAt(0)
@@ -544,27 +707,25 @@ class CheckAvailabilityWindow(QWidget):
         
         return working_hours
     
+    def cancel_check(self, *args):
+        """Cancel the running availability check, if any"""
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.current_worker = None
+            self.status_label.setText("Cancelled: inputs changed")
+
     def check_availability(self):
+        self.cancel_check()
         self.results_text.clear()
-        # Disable the check button while processing
-        check_button = self.sender()
-        if check_button:
-            check_button.setEnabled(False)
+        self.status_label.setText("")
         
-        # Set wait cursor
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-
         try:
-            total_start = time.time() # Debug
-            print(f"\n=== Performance Log ===") # Debug
-            cal_start = time.time() # Debug
-
             try:
-                available_calendars = list_calendars()
                 current_calendar = self.calendar_combo.currentText()
-                print(f"Calendar check took: {time.time() - cal_start:.2f} seconds")
+                calendar_available = calendar_exists(current_calendar)
                 
-                if current_calendar not in available_calendars:
+                if not calendar_available:
+                    available_calendars = list_calendars()
                     response = QMessageBox.warning(
                         self,
                         "Calendar Not Available",
@@ -595,79 +756,79 @@ class CheckAvailabilityWindow(QWidget):
                 return
             
             # Get working hours
-            hours_start = time.time()            # Debug
             working_hours = self.get_working_hours()
-            print(f"Working hours check took: {time.time() - hours_start:.2f} seconds")
             if working_hours is None:
                 return
 
             # Get selected calendar
-            selected_calendar = self.calendar_combo.currentText() # Debug
+            selected_calendar = self.calendar_combo.currentText()
             
             # Get selected dates
-            dates_start = time.time()             # Debug
             selected_dates = []
             for date_widget in self.date_widgets:
                 qdate = date_widget.date()
                 date = datetime(qdate.year(), qdate.month(), qdate.day())
                 selected_dates.append(date)
-            print(f"Date processing took: {time.time() - dates_start:.2f} seconds") # Debug
-
+            selected_dates.sort()
 
             # Get duration
             duration = self.duration_input.value()
             
-            # Get location and timezone
-            loc_start = time.time()            
+            # Save the location to config; geocoding happens on the worker
             location = self.location_input.text()
-            timezone_str = None
             if location:
-                # Save the location to config
                 self.config['last_location'] = location
                 from config import save_config
                 save_config(self.config)
-
-                timezone_str = get_location_timezone(location)
-                if not timezone_str:
-                    self.results_text.setText("Could not determine timezone for the given location.")
-                    return
-            print(f"Location/timezone processing took: {time.time() - loc_start:.2f} seconds")# Debug
-            
-            # Process availability
-            slots_start = time.time() # Debug            
-            all_available_slots = {}
-            for target_date in selected_dates:
-                print(f"\nProcessing date: {target_date.strftime('%Y-%m-%d')}") # Debug
-                event_fetch_start = time.time() # Debug
-                available_slots = get_available_slots(
-                    selected_calendar,
-                    target_date,
-                    working_hours,
-                    duration,
-                    timezone_str
-                )
-                print(f"Event fetch and slot calculation took: {time.time() - event_fetch_start:.2f} seconds") # Debug
-                all_available_slots[target_date.date()] = available_slots
-            print(f"Total slots processing took: {time.time() - slots_start:.2f} seconds")# Debug
-
-            
-            # Format and display results
-            format_start = time.time()            # Debug
-            results = format_multiple_days_email(all_available_slots, timezone_str)
-            self.results_text.setText(results)
-            print(f"Results formatting took: {time.time() - format_start:.2f} seconds")# Debug
-            
-            print(f"\nTotal execution time: {time.time() - total_start:.2f} seconds")
-            print("===================\n")
-
         except Exception as e:
             self.results_text.setText(f"An error occurred: {str(e)}")
-        finally:
-            # Restore cursor
-            QApplication.restoreOverrideCursor()
-            # Re-enable the check button
-            if check_button:
-                check_button.setEnabled(True)
+            return
+        
+        # Hand the slow part (geocoding, calendar query, slot computation) to a worker
+        next_count = self.next_slots_input.value() if self.next_slots_checkbox.isChecked() else None
+        self.check_generation += 1
+        worker = AvailabilityWorker(
+            self.check_generation, selected_calendar, selected_dates, working_hours, duration, location,
+            next_count=next_count, working_days=get_working_days(self.config)
+        )
+        worker.signals.progress.connect(self.on_check_progress)
+        worker.signals.day_ready.connect(self.on_day_ready)
+        worker.signals.finished.connect(self.on_check_finished)
+        worker.signals.failed.connect(self.on_check_failed)
+        self.current_worker = worker
+        if next_count:
+            self.status_label.setText(f"Searching for the next {next_count} slot(s)...")
+        else:
+            self.status_label.setText(f"Checking {len(selected_dates)} date(s)...")
+        self.thread_pool.start(worker)
+
+    def _is_current(self, generation):
+        return self.current_worker is not None and generation == self.check_generation
+
+    def on_check_progress(self, generation, done, total):
+        if self._is_current(generation):
+            self.status_label.setText(f"Checked {done} of {total} date(s)...")
+
+    def on_day_ready(self, generation, date, slots, timezone_str):
+        """Show each day's result as soon as it is computed"""
+        if self._is_current(generation):
+            if slots:
+                self.results_text.append(format_multiple_days_email({date: slots}, timezone_str))
+            else:
+                self.results_text.append(f"No availability on {date.strftime('%A, %B %d')}.")
+
+    def on_check_finished(self, generation, all_available_slots, timezone_str):
+        if self._is_current(generation):
+            # Replace the per-day preview with the combined text
+            self.results_text.setText(format_multiple_days_email(all_available_slots, timezone_str))
+            self.status_label.setText("")
+            self.current_worker = None
+
+    def on_check_failed(self, generation, message):
+        if self._is_current(generation):
+            self.results_text.setText(message)
+            self.status_label.setText("")
+            self.current_worker = None
 
     def copy_to_clipboard(self):
         clipboard = QApplication.clipboard()
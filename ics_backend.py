@@ -0,0 +1,432 @@
+"""Calendar backend reading iCalendar (.ics) files
+
+Runs the availability pipeline without EventKit, e.g. on Linux build hosts
+or against a CalDAV directory export. Each .ics file is one calendar, named
+by its X-WR-CALNAME header or, failing that, by the file name.
+
+Files are parsed as a stream of VEVENTs; only the start/end epoch seconds of
+timed events are kept in memory, as array('q') columns. Recurring events
+(RRULE, RDATE, EXDATE and RECURRENCE-ID overrides) are kept as series and
+expanded for each queried range by the recurrence module.
+"""
+import math
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from calendar_backend import CalendarAccessError, CalendarBackend, bucket_intervals_by_day
+from recurrence import RecurringSeries, wall_timestamp
+from tracing import span
+
+DURATION_PATTERN = re.compile(
+    r'^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+
+
+def iter_content_lines(fileobj):
+    """Yield unfolded iCalendar content lines from a text file object"""
+    current = None
+    for raw_line in fileobj:
+        line = raw_line.rstrip('\r\n')
+        if line[:1] in (' ', '\t'):
+            # Folded continuation of the previous line
+            if current is not None:
+                current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_content_line(line):
+    """Split a content line into (name, params, value)"""
+    head, _, value = line.partition(':')
+    name, *param_parts = head.split(';')
+    params = {}
+    for part in param_parts:
+        key, _, param_value = part.partition('=')
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def iter_vevents(fileobj):
+    """Stream VEVENT components from an iCalendar file
+
+    Yields:
+        dict: Maps property names to lists of (params, value) tuples
+    """
+    event = None
+    depth = 0
+    for line in iter_content_lines(fileobj):
+        name, params, value = parse_content_line(line)
+        if name == 'BEGIN':
+            if value.upper() == 'VEVENT' and event is None:
+                event = {}
+                depth = 0
+            elif event is not None:
+                # Nested component such as VALARM; its properties are ignored
+                depth += 1
+        elif name == 'END':
+            if event is not None and depth:
+                depth -= 1
+            elif event is not None and value.upper() == 'VEVENT':
+                yield event
+                event = None
+        elif event is not None and not depth:
+            event.setdefault(name, []).append((params, value))
+
+
+def read_calendar_name(path):
+    """Read X-WR-CALNAME from the calendar header without parsing any events"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in iter_content_lines(f):
+            name, _, value = parse_content_line(line)
+            if name == 'X-WR-CALNAME' and value:
+                return value
+            if name == 'BEGIN' and value.upper() == 'VEVENT':
+                break
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def parse_ics_wall_time(params, value):
+    """Parse a DATE or DATE-TIME value without converting it
+
+    Returns:
+        tuple: (naive_datetime, zone, is_all_day). zone is None for floating
+            times and unknown TZIDs, which are in the machine's local timezone.
+    """
+    value = value.strip()
+    if params.get('VALUE', '').upper() == 'DATE' or len(value) == 8:
+        return datetime.strptime(value[:8], '%Y%m%d'), None, True
+
+    naive = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    if value.endswith('Z'):
+        return naive, timezone.utc, False
+
+    tzid = params.get('TZID')
+    if tzid:
+        try:
+            return naive, ZoneInfo(tzid), False
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return naive, None, False
+
+
+def parse_ics_datetime(params, value):
+    """Parse a DATE or DATE-TIME value
+
+    Returns:
+        tuple: (epoch_seconds, is_all_day). Floating times and unknown TZIDs
+            are interpreted in the machine's local timezone.
+    """
+    naive, zone, all_day = parse_ics_wall_time(params, value)
+    return wall_timestamp(naive, zone), all_day
+
+
+def parse_ics_duration(value):
+    """Parse an iCalendar DURATION value into a timedelta"""
+    match = DURATION_PATTERN.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    parts = {k: int(v) for k, v in match.groupdict().items() if v and k != 'sign'}
+    duration = timedelta(**parts)
+    return -duration if match.group('sign') == '-' else duration
+
+
+def event_timestamps(event):
+    """Return (start_ts, end_ts) for a timed event, or None to skip it"""
+    if 'DTSTART' not in event:
+        return None
+    status = event.get('STATUS', [({}, '')])[0][1].upper()
+    if status == 'CANCELLED':
+        return None
+
+    start_ts, all_day = parse_ics_datetime(*event['DTSTART'][0])
+    if all_day:  # Skip all-day events
+        return None
+
+    if 'DTEND' in event:
+        end_ts, _ = parse_ics_datetime(*event['DTEND'][0])
+    elif 'DURATION' in event:
+        end_ts = start_ts + parse_ics_duration(event['DURATION'][0][1]).total_seconds()
+    else:
+        end_ts = start_ts
+    return start_ts, end_ts
+
+
+def instance_timestamps(entries, dtstart, zone):
+    """Yield the starts of the instances named by EXDATE or RECURRENCE-ID values
+
+    A DATE value names the instance on that day, at the series' start time.
+    """
+    for params, value in entries:
+        for item in value.split(','):
+            naive, item_zone, all_day = parse_ics_wall_time(params, item)
+            if all_day:
+                yield wall_timestamp(datetime.combine(naive.date(), dtstart.time()), zone)
+            else:
+                yield wall_timestamp(naive, item_zone)
+
+
+def rdate_periods(entries, duration):
+    """Yield (start_ts, end_ts) of the DATE-TIME and PERIOD values of RDATE properties"""
+    for params, value in entries:
+        for item in value.split(','):
+            start_text, _, end_text = item.partition('/')
+            start_ts, all_day = parse_ics_datetime(params, start_text)
+            if all_day:
+                continue  # All-day instances are skipped like all-day events
+            if not end_text:
+                yield start_ts, start_ts + duration
+            elif end_text.lstrip('+-').startswith('P'):
+                yield start_ts, start_ts + parse_ics_duration(end_text).total_seconds()
+            else:
+                yield start_ts, parse_ics_datetime(params, end_text)[0]
+
+
+def event_series(event):
+    """Return the RecurringSeries of a timed recurring event, or None to skip it"""
+    timestamps = event_timestamps(event)
+    if timestamps is None:
+        return None
+    start_ts, end_ts = timestamps
+    dtstart, zone, _ = parse_ics_wall_time(*event['DTSTART'][0])
+    duration = end_ts - start_ts
+    rrule = event['RRULE'][0][1] if 'RRULE' in event else None
+    return RecurringSeries(
+        dtstart, duration, rrule,
+        rdates=rdate_periods(event.get('RDATE', []), duration),
+        exdates=instance_timestamps(event.get('EXDATE', []), dtstart, zone),
+        zone=zone
+    )
+
+
+class _CalendarIndex:
+    """Events of one calendar
+
+    Single timed events are kept sorted by start as parallel arrays;
+    recurring series are kept whole and expanded per query.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.starts = array('q')
+        self.ends = array('q')
+        self.max_duration = 0
+        self.series = []
+
+        events = []
+        series_by_uid = {}
+        overrides = []  # (UID, RECURRENCE-ID values) of modified or cancelled instances
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for event in iter_vevents(f):
+                uid = event.get('UID', [({}, None)])[0][1]
+                try:
+                    if 'RECURRENCE-ID' in event:
+                        overrides.append((uid, event['RECURRENCE-ID']))
+                    elif 'RRULE' in event or 'RDATE' in event:
+                        series = event_series(event)
+                        if series is not None:
+                            self.series.append(series)
+                            if uid:
+                                series_by_uid[uid] = series
+                        continue
+                    timestamps = event_timestamps(event)
+                except ValueError:
+                    continue  # Malformed event; skip rather than fail the calendar
+                if timestamps is not None:
+                    events.append(timestamps)
+        # An override replaces its instance; a cancelled one just removes it
+        for uid, recurrence_ids in overrides:
+            series = series_by_uid.get(uid)
+            if series is None:
+                continue
+            try:
+                for start_ts in instance_timestamps(recurrence_ids, series.dtstart, series.zone):
+                    series.exclude(start_ts)
+            except ValueError:
+                continue
+        events.sort()
+        for start_ts, end_ts in events:
+            self.starts.append(math.floor(start_ts))
+            self.ends.append(math.ceil(end_ts))
+            self.max_duration = max(self.max_duration, self.ends[-1] - self.starts[-1])
+
+    def diff(self, other):
+        """Return the (start_ts, end_ts) periods that differ between two indexes
+
+        Returns:
+            list: Sorted periods, or None if an unbounded series changed and
+                the whole calendar must be considered changed
+        """
+        mine = set(zip(self.starts, self.ends))
+        theirs = set(zip(other.starts, other.ends))
+        changed = mine ^ theirs
+
+        my_series = {series.base_key(): series for series in self.series}
+        their_series = {series.base_key(): series for series in other.series}
+        for key in my_series.keys() ^ their_series.keys():
+            first, last = (my_series.get(key) or their_series[key]).bounds()
+            if last is None:
+                return None
+            changed.add((first, last))
+        for key in my_series.keys() & their_series.keys():
+            series = my_series[key]
+            for start_ts in series.exdates ^ their_series[key].exdates:
+                changed.add((start_ts, start_ts + series.duration))
+        return sorted(changed)
+
+    def overlapping(self, range_start, range_end):
+        """Yield (start_ts, end_ts) of events overlapping [range_start, range_end]"""
+        first = bisect_left(self.starts, range_start - self.max_duration)
+        last = bisect_right(self.starts, range_end)
+        for i in range(first, last):
+            if self.ends[i] > range_start or self.starts[i] >= range_start:
+                yield self.starts[i], self.ends[i]
+        for series in self.series:
+            yield from series.occurrences(range_start, range_end)
+
+
+def file_signature(path):
+    """Cheap change marker for a file, standing in for an HTTP ETag"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ICSCalendarBackend(CalendarBackend):
+    """Calendar backend over an .ics file or a directory of .ics files
+
+    A file whose mtime, size or inode changes is re-read on the next query,
+    and its cached days are dropped.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = os.path.expanduser(path)
+        if not os.path.exists(self.path):
+            raise CalendarAccessError(f"ICS path '{self.path}' not found")
+        self.paths = {}
+        self._indexes = {}  # calendar name -> (file signature, _CalendarIndex)
+        self._index_lock = threading.Lock()  # Concurrent fetches parse a file once
+        self._listing_signature = None
+        self._seen = {}  # calendar name -> file signature when last validated
+        self._validation_locks = {}  # calendar name -> Lock held while checking and refreshing it
+        self._scan()
+
+    def _scan(self):
+        """(Re)build the calendar name -> file map if the export changed"""
+        signature = file_signature(self.path)
+        if signature == self._listing_signature:
+            return
+        if os.path.isdir(self.path):
+            paths = sorted(
+                os.path.join(self.path, name) for name in os.listdir(self.path)
+                if name.lower().endswith('.ics')
+            )
+        else:
+            paths = [self.path]
+
+        calendar_paths = {}
+        for ics_path in paths:
+            calendar_paths.setdefault(read_calendar_name(ics_path), ics_path)
+        for calendar_name in set(self.paths) - set(calendar_paths):
+            self._indexes.pop(calendar_name, None)
+            self.invalidate_cache(calendar_name)
+        self.paths = calendar_paths
+        self._listing_signature = signature
+
+    def list_calendars(self):
+        """List all available calendars"""
+        self._scan()
+        return list(self.paths)
+
+    def has_calendar(self, calendar_name):
+        """Check whether a calendar with this title exists"""
+        self._scan()
+        return calendar_name in self.paths
+
+    def _source_signature(self, calendar_name):
+        path = self.paths.get(calendar_name)
+        try:
+            return [calendar_name, *file_signature(path)] if path else None
+        except OSError:
+            return None
+
+    def _validate_cache(self, calendar_name):
+        """Refresh a calendar whose file changed, dropping only the days it touched
+
+        If the previous parse is in memory, the file is re-parsed and diffed
+        against it and only the days around added, removed or moved events
+        are invalidated; otherwise the whole calendar is.
+
+        Concurrent fetches of the calendar wait here until its stale days are
+        dropped, rather than serving them from the day cache meanwhile.
+        """
+        self._scan()
+        with self._index_lock:
+            lock = self._validation_locks.setdefault(calendar_name, threading.Lock())
+        with lock:
+            path = self.paths.get(calendar_name)
+            try:
+                current = file_signature(path) if path else None
+            except OSError:
+                current = None
+            seen = self._seen.get(calendar_name)
+            if seen is not None and seen != current:
+                self._refresh(calendar_name, path, current)
+            # Only marked as seen once its stale days are gone
+            self._seen[calendar_name] = current
+
+    def _refresh(self, calendar_name, path, current):
+        """Drop the cached days a changed file touched; see _validate_cache"""
+        with self._index_lock:
+            cached = self._indexes.pop(calendar_name, None)
+        if current is None or cached is None or cached[1].path != path:
+            self.invalidate_cache(calendar_name)
+            return
+        try:
+            new_index = self._get_index(calendar_name)
+        except (OSError, CalendarAccessError):
+            self.invalidate_cache(calendar_name)
+            return
+        changes = cached[1].diff(new_index)
+        if changes is None:
+            self.invalidate_cache(calendar_name)
+            return
+        for start_ts, end_ts in changes:
+            self.invalidate_range(calendar_name, start_ts, end_ts)
+        if self.freebusy_index is not None:
+            self.freebusy_index.set_signature(calendar_name, self._source_signature(calendar_name))
+
+    def _get_index(self, calendar_name):
+        with self._index_lock:
+            cached = self._indexes.get(calendar_name)
+            if cached is None:
+                path = self.paths.get(calendar_name)
+                if path is None:
+                    raise CalendarAccessError(f"Calendar '{calendar_name}' not found")
+                # Take the signature first so a write during parsing is caught next time
+                signature = file_signature(path)
+                cached = self._indexes[calendar_name] = (signature, _CalendarIndex(path))
+            return cached[1]
+
+    def _fetch_events_for_range(self, calendar_name, span_start, span_end):
+        """Get events of one calendar for a span of days from its index"""
+        with span('calendar.lookup'):
+            index = self._get_index(calendar_name)
+        with span('calendar.query') as query_span:
+            starts = array('q')
+            ends = array('q')
+            for start_ts, end_ts in index.overlapping(span_start.timestamp(), span_end.timestamp()):
+                starts.append(start_ts)
+                ends.append(end_ts)
+            query_span.set(events=len(starts))
+        with span('calendar.convert'):
+            return bucket_intervals_by_day(starts, ends, span_start, span_end)
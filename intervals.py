@@ -0,0 +1,195 @@
+"""Integer interval arithmetic for availability computation
+
+Intervals are half-open [start, end) ranges of epoch minutes, stored as
+parallel start/end arrays. Busy intervals are sorted and merged once, and
+free gaps are produced with a single linear sweep.
+"""
+import heapq
+from array import array
+
+
+def merge_intervals(starts, ends):
+    """Sort and merge busy intervals
+
+    Overlapping, touching and nested intervals collapse into one. Empty or
+    inverted intervals are dropped.
+
+    Args:
+        starts (sequence): Interval start minutes
+        ends (sequence): Interval end minutes, parallel to starts
+
+    Returns:
+        tuple: (starts, ends) as sorted, disjoint array('q') columns
+    """
+    order = sorted(
+        (i for i in range(len(starts)) if ends[i] > starts[i]),
+        key=starts.__getitem__
+    )
+    merged_starts = array('q')
+    merged_ends = array('q')
+    for i in order:
+        start, end = starts[i], ends[i]
+        if merged_ends and start <= merged_ends[-1]:
+            if end > merged_ends[-1]:
+                merged_ends[-1] = end
+        else:
+            merged_starts.append(start)
+            merged_ends.append(end)
+    return merged_starts, merged_ends
+
+
+def free_gaps(window_start, window_end, busy_starts, busy_ends, min_length=0):
+    """Find the gaps inside a window not covered by merged busy intervals
+
+    Args:
+        window_start (int): Window start minute
+        window_end (int): Window end minute
+        busy_starts (sequence): Sorted, disjoint busy starts (see merge_intervals)
+        busy_ends (sequence): Busy ends, parallel to busy_starts
+        min_length (int): Drop gaps shorter than this many minutes
+
+    Returns:
+        list: (start, end) minute tuples in chronological order
+    """
+    gaps = []
+    cursor = window_start
+    for start, end in zip(busy_starts, busy_ends):
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start - cursor >= max(min_length, 1):
+            gaps.append((cursor, start))
+        cursor = end
+        if cursor >= window_end:
+            break
+    if window_end - cursor >= max(min_length, 1):
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def free_gaps_in_windows(window_starts, window_ends, busy_starts, busy_ends, min_length=0):
+    """Find the free gaps of many windows in one pass over a busy stream
+
+    Busy intervals spanning several windows (overnight or multi-day events)
+    are clipped to each window they overlap.
+
+    Args:
+        window_starts (sequence): Window start minutes, ascending
+        window_ends (sequence): Window end minutes, parallel to window_starts
+        busy_starts (sequence): Sorted, disjoint busy starts (see merge_intervals)
+        busy_ends (sequence): Busy ends, parallel to busy_starts
+        min_length (int): Drop gaps shorter than this many minutes
+
+    Returns:
+        list: One list of (start, end) minute tuples per window
+    """
+    needed = max(min_length, 1)
+    count = len(busy_starts)
+    first = 0
+    result = []
+    for window_start, window_end in zip(window_starts, window_ends):
+        # Intervals ending before this window cannot reach any later window
+        while first < count and busy_ends[first] <= window_start:
+            first += 1
+        gaps = []
+        cursor = window_start
+        i = first
+        while i < count and busy_starts[i] < window_end and cursor < window_end:
+            if busy_starts[i] - cursor >= needed:
+                gaps.append((cursor, busy_starts[i]))
+            cursor = max(cursor, busy_ends[i])
+            i += 1
+        if window_end - cursor >= needed:
+            gaps.append((cursor, window_end))
+        result.append(gaps)
+    return result
+
+
+def _union_sweep(busy_lists):
+    """Yield the union of several sorted, disjoint busy lists in order
+
+    Uses a k-way heap merge, so the cost is O(total intervals * log N).
+    """
+    merged = heapq.merge(*(zip(starts, ends) for starts, ends in busy_lists))
+    current_start = current_end = None
+    for start, end in merged:
+        if current_end is not None and start <= current_end:
+            if end > current_end:
+                current_end = end
+            continue
+        if current_end is not None:
+            yield current_start, current_end
+        current_start, current_end = start, end
+    if current_end is not None:
+        yield current_start, current_end
+
+
+def common_free_gaps(window_start, window_end, busy_lists, min_length=0):
+    """Find the gaps in which every attendee is free
+
+    Args:
+        window_start (int): Window start minute
+        window_end (int): Window end minute
+        busy_lists (list): One (starts, ends) pair per attendee or calendar,
+            each sorted and disjoint (see merge_intervals)
+        min_length (int): Drop gaps shorter than this many minutes
+
+    Returns:
+        list: (start, end) minute tuples in chronological order
+    """
+    union_starts = array('q')
+    union_ends = array('q')
+    for start, end in _union_sweep(busy_lists):
+        union_starts.append(start)
+        union_ends.append(end)
+    return free_gaps(window_start, window_end, union_starts, union_ends, min_length)
+
+
+def quorum_free_gaps(window_start, window_end, busy_lists, quorum, min_length=0):
+    """Find the gaps in which at least `quorum` of the attendees are free
+
+    Args:
+        window_start (int): Window start minute
+        window_end (int): Window end minute
+        busy_lists (list): One (starts, ends) pair per attendee, each sorted
+            and disjoint (see merge_intervals)
+        quorum (int): Minimum number of free attendees
+        min_length (int): Drop gaps shorter than this many minutes
+
+    Returns:
+        list: (start, end) minute tuples in chronological order
+    """
+    attendees = len(busy_lists)
+    if quorum > attendees:
+        return []
+    max_busy = attendees - quorum
+
+    def boundaries(starts, ends):
+        for start, end in zip(starts, ends):
+            yield start, 1
+            yield end, -1
+
+    # k-way merge of every attendee's start/end boundaries
+    merged = heapq.merge(*(boundaries(starts, ends) for starts, ends in busy_lists))
+
+    gaps = []
+    busy = 0
+    free_start = window_start
+    pending = next(merged, None)
+    while pending is not None and pending[0] < window_end:
+        moment = pending[0]
+        # Apply every boundary at this moment before judging the count
+        was_free = busy <= max_busy
+        while pending is not None and pending[0] == moment:
+            busy += pending[1]
+            pending = next(merged, None)
+        is_free = busy <= max_busy
+        if was_free and not is_free:
+            if moment > window_start and moment - free_start >= max(min_length, 1):
+                gaps.append((free_start, moment))
+        elif is_free and not was_free:
+            free_start = max(moment, window_start)
+    if busy <= max_busy and window_end - free_start >= max(min_length, 1):
+        gaps.append((free_start, window_end))
+    return gaps
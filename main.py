@@ -1,17 +1,19 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
 from datetime import datetime, timedelta
-import pytz
-import time
-from config import load_config, setup_initial_config
-from calendar_access import CalendarAccess, CalendarAccessError
+from config import DEFAULT_CONFIG, load_config, setup_initial_config
+from calendar_backend import get_backend, BusyIntervals, CalendarAccessError
+from timezone_resolver import TimezoneResolver
+from intervals import merge_intervals, free_gaps_in_windows, common_free_gaps, quorum_free_gaps
+from timezones import get_zone, is_valid_zone, to_datetimes, wall_time_to_epoch
+from tracing import traced
 
-class CalendarAccessError(Exception):
-    """Custom exception for calendar access errors"""
-    pass
-    
 def list_calendars():
     """List all available calendars"""
     try:
-        calendar_access = CalendarAccess.get_instance()
+        calendar_access = get_backend()
         calendars = calendar_access.list_calendars()
         if not calendars:
             raise CalendarAccessError("No calendars found. Please ensure Calendar app is set up.")
@@ -19,79 +21,443 @@ def list_calendars():
     except Exception as e:
         raise CalendarAccessError(f"Failed to access calendars: {str(e)}")
 
+@traced('calendar.check')
+def calendar_exists(calendar_name):
+    """Check that a calendar is still available without listing them all"""
+    try:
+        return get_backend().has_calendar(calendar_name)
+    except Exception as e:
+        raise CalendarAccessError(f"Failed to access calendars: {str(e)}")
+
 def get_available_slots(calendar_name, target_date, working_hours, duration_minutes=60, target_tz=None):
     """Find available time slots for a given date"""
-    # Set up timezone info
-    local_tz = pytz.timezone('Asia/Jerusalem')  # Your local timezone
-    target_pytz = pytz.timezone(target_tz) if target_tz else local_tz
-    
-    # Create datetime objects with timezone info
-    date_str = target_date.strftime('%Y-%m-%d')
-    day_start = local_tz.localize(datetime.strptime(f"{date_str} {working_hours['start']}", '%Y-%m-%d %H:%M'))
-    day_end = local_tz.localize(datetime.strptime(f"{date_str} {working_hours['end']}", '%Y-%m-%d %H:%M'))
+    events_by_date = get_events_for_dates(calendar_name, [target_date], working_hours)
+    return get_available_slots_multi_day(
+        events_by_date, [target_date], working_hours, duration_minutes, target_tz
+    )[target_date.date()]
+
+def get_events_for_dates(calendar_name, target_dates, working_hours=None):
+    """Fetch events for all target dates with a single calendar query
     
-    # Convert working hours to target timezone if needed
-    if target_tz:
-        day_start = day_start.astimezone(target_pytz)
-        day_end = day_end.astimezone(target_pytz)
+    Args:
+        calendar_name (str or list): Calendar name(s); events of several
+            calendars are combined
+        working_hours (dict): If the hours run past midnight, the day after
+            the last date is fetched too
     
-    # Get busy periods using new calendar access
+    Returns:
+        dict: Maps each date to its BusyIntervals
+        
+    Raises:
+        CalendarAccessError: If the calendar could not be queried. An empty
+            result would read as a completely free calendar.
+    """
+    if not target_dates:
+        return {}
+    last_date = max(target_dates)
+    if working_hours and _is_overnight(working_hours):
+        last_date += timedelta(days=1)
     try:
-        calendar_access = CalendarAccess.get_instance()
-        busy_periods = calendar_access.get_events_for_date(calendar_name, target_date)
-        if busy_periods is None:
-            return []
+        calendar_access = get_backend()
+        return calendar_access.get_events_for_range(calendar_name, min(target_dates), last_date)
+    except CalendarAccessError:
+        raise
     except Exception as e:
-        print(f"Error getting events: {str(e)}")
-        return []
-    
-    # Add timezone info to event times and convert to target timezone
-    target_events = []
-    for start, end in busy_periods:
-        # Add local timezone info to naive datetimes
-        if start.tzinfo is None:
-            start = local_tz.localize(start)
-        if end.tzinfo is None:
-            end = local_tz.localize(end)
-            
-        # Convert to target timezone if needed
-        if target_tz:
-            start = start.astimezone(target_pytz)
-            end = end.astimezone(target_pytz)
-            
-        # Filter events for target date
-        if start.date() == target_date.date():
-            target_events.append((start, end))
-    
-    # Start with the full working day as one available slot
-    available_slots = [(day_start, day_end)]
-    
-    # Remove busy periods from available slots
-    for busy_start, busy_end in target_events:
-        new_available_slots = []
-        for avail_start, avail_end in available_slots:
-            # If busy period overlaps with available slot
-            if busy_start < avail_end and busy_end > avail_start:
-                # Add time before busy period if there's enough time
-                if busy_start > avail_start:
-                    new_available_slots.append((avail_start, busy_start))
-                # Add time after busy period if there's enough time
-                if busy_end < avail_end:
-                    new_available_slots.append((busy_end, avail_end))
-            else:
-                # No overlap, keep the slot as is
-                new_available_slots.append((avail_start, avail_end))
-        available_slots = new_available_slots
+        raise CalendarAccessError(f"Error getting events: {str(e)}")
+
+@traced('slots.compute')
+def get_available_slots_multi_day(events_by_date, target_dates, working_hours, duration_minutes=60, target_tz=None):
+    """Find available time slots for several dates from pre-bucketed events
+    
+    All events of the range are merged into one sorted stream, and every
+    working window is swept in a single pass over it. Events are clipped to
+    the windows they overlap, so events starting the evening before, spanning
+    several days, or running into overnight working hours are all counted.
+    
+    Args:
+        events_by_date (dict): Maps dates to busy periods (BusyIntervals or
+            (start, end) tuples), as returned by get_events_for_range
+        target_dates (list): Dates (datetime) to compute slots for
+        
+    Returns:
+        dict: Maps each target date (date) to its list of available slots
+    """
+    target_dates = sorted(set(target_dates))
+    windows = [_working_window(target_date, working_hours, target_tz) for target_date in target_dates]
+    busy_starts, busy_ends = _busy_stream(events_by_date.values())
+    gaps_per_window = free_gaps_in_windows(
+        [window[0] for window in windows],
+        [window[1] for window in windows],
+        busy_starts,
+        busy_ends,
+        duration_minutes
+    )
+    return {
+        target_date.date(): _slots_from_gaps(gaps, window[2])
+        for target_date, window, gaps in zip(target_dates, windows, gaps_per_window)
+    }
+
+@traced('slots.compute_grid')
+def get_available_slots_grid(events_by_date, target_dates, working_hours, duration_minutes=60, target_tz=None,
+                             granularity=1):
+    """Opt-in NumPy variant of get_available_slots_multi_day
+    
+    Uses the availability grid, with the same clipping semantics as
+    get_available_slots_multi_day. The BusyIntervals columns are read through
+    np.frombuffer, so there is no per-event Python work. The sweep is faster
+    except on calendars of many stacked meetings (see
+    benchmarks/grid_vs_sweep.py) and stays the default.
+    
+    Args:
+        granularity (int): Grid cell size in minutes; slots start on cell boundaries
+    
+    Returns:
+        dict: Maps each target date (date) to its list of available slots
+    """
+    import numpy as np
+    from availability_grid import free_runs_grid
+    
+    target_dates = sorted(set(target_dates))
+    windows = [_working_window(target_date, working_hours, target_tz) for target_date in target_dates]
+    
+    # All busy columns of the range at once; copies of multi-day events are
+    # painted twice, which is harmless
+    starts = [np.empty(0, np.int64)]
+    ends = [np.empty(0, np.int64)]
+    for busy_periods in events_by_date.values():
+        if not isinstance(busy_periods, BusyIntervals):
+            busy_periods = BusyIntervals.from_datetimes(busy_periods)
+        busy_starts, busy_ends = busy_periods.timed_columns()
+        starts.append(np.frombuffer(busy_starts, dtype=np.int64))
+        ends.append(np.frombuffer(busy_ends, dtype=np.int64))
+    
+    runs = free_runs_grid(
+        [window[0] for window in windows],
+        [window[1] for window in windows],
+        np.concatenate(starts) // 60,
+        -(-np.concatenate(ends) // 60),  # Round partial minutes up
+        min_length=duration_minutes,
+        granularity=granularity
+    )
+    return {
+        target_date.date(): _slots_from_gaps(gaps, window[2])
+        for target_date, window, gaps in zip(target_dates, windows, runs)
+    }
+
+@traced('slots.compute_common')
+def get_common_available_slots(calendar_names, target_dates, working_hours, duration_minutes=60,
+                               target_tz=None, quorum=None):
+    """Find slots in which several calendars (or attendees) are free together
+    
+    Args:
+        calendar_names (list): Calendars to intersect, one per attendee
+        target_dates (list): Dates (datetime) to compute slots for
+        quorum (int): If given, a slot only needs this many of the calendars
+            to be free instead of all of them
+        
+    Returns:
+        dict: Maps each target date (date) to its list of available slots
+        
+    Raises:
+        CalendarAccessError: If any of the calendars cannot be read; an
+            unreadable attendee must not count as free
+    """
+    target_dates = sorted(set(target_dates))
+    busy_lists = [
+        _busy_stream(get_events_for_dates(name, target_dates, working_hours).values())
+        for name in calendar_names
+    ]
+    
+    all_slots = {}
+    for target_date in target_dates:
+        window_start, window_end, target_zone = _working_window(target_date, working_hours, target_tz)
+        window_lists = [_clip_to_window(starts, ends, window_start, window_end) for starts, ends in busy_lists]
+        if quorum is None:
+            gaps = common_free_gaps(window_start, window_end, window_lists, duration_minutes)
+        else:
+            gaps = quorum_free_gaps(window_start, window_end, window_lists, quorum, duration_minutes)
+        all_slots[target_date.date()] = _slots_from_gaps(gaps, target_zone)
+    return all_slots
+
+class TimezoneLookupError(Exception):
+    """Raised when a location cannot be resolved to a timezone"""
+    pass
+
+MAX_FETCH_WORKERS = 4
+MAX_DAYS_PER_FETCH = 7
+LOOKAHEAD_DAYS = (1, 3, 7, 14, 28, 56, 112)  # Growing search horizon for find_next_slots
+PREFETCH_DAYS = 90
+
+_executor = None
+
+def _get_executor():
+    """Return the shared, bounded pool used for calendar fetches and geocoding"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix="availability")
+    return _executor
+
+def _date_runs(target_dates):
+    """Split sorted dates into runs of consecutive days, at most MAX_DAYS_PER_FETCH long"""
+    runs = []
+    for target_date in sorted(set(target_dates)):
+        if (runs and len(runs[-1]) < MAX_DAYS_PER_FETCH
+                and target_date.date() - runs[-1][-1].date() <= timedelta(days=1)):
+            runs[-1].append(target_date)
+        else:
+            runs.append([target_date])
+    return runs
+
+def fetch_events_async(calendar_name, target_dates, working_hours=None):
+    """Start fetching events for the target dates on the shared pool
+    
+    Dates are grouped into runs of consecutive days and each run is fetched
+    with one range query, concurrently with the other runs.
+    
+    Args:
+        working_hours (dict): Passed on to get_events_for_dates, so overnight
+            hours fetch the day after each run
+    
+    Returns:
+        list: (dates, future) pairs in date order; each future resolves to
+            the dict returned by get_events_for_dates
+    """
+    executor = _get_executor()
+    return [
+        (run, executor.submit(get_events_for_dates, calendar_name, run, working_hours))
+        for run in _date_runs(target_dates)
+    ]
+
+def collect_available_slots(calendar_name, target_dates, working_hours, duration_minutes=60, target_tz=None,
+                            location=None, fetches=None, on_day=None, is_cancelled=None):
+    """Fetch events and compute slots for several dates concurrently
+    
+    Args:
+        target_tz (str): Display timezone; ignored if location is given
+        location (str): Location to geocode, in parallel with the calendar fetch
+        fetches (list): Result of an earlier fetch_events_async call to reuse
+        on_day (callable): Called with (date, slots, timezone) as each date completes,
+            in date order
+        is_cancelled (callable): Polled between runs of dates; returning True stops the work
+        
+    Returns:
+        tuple: (timezone, dict mapping each date to its slots), or None if cancelled
+        
+    Raises:
+        TimezoneLookupError: If location cannot be resolved
+        CalendarAccessError: If the calendar cannot be read
+    """
+    if fetches is None:
+        fetches = fetch_events_async(calendar_name, target_dates, working_hours)
+    
+    if location:
+        # Geocode on this thread while the pool fetches events
+        target_tz = get_location_timezone(location)
+        if not target_tz:
+            for _, future in fetches:
+                future.cancel()
+            raise TimezoneLookupError("Could not determine timezone for the given location.")
+    
+    all_slots = {}
+    for run, future in fetches:
+        events_by_date = future.result()
+        if is_cancelled and is_cancelled():
+            for _, pending in fetches:
+                pending.cancel()
+            return None
+        # One pass over the run's event stream computes all of its days
+        run_slots = get_available_slots_multi_day(
+            events_by_date, run, working_hours, duration_minutes, target_tz
+        )
+        for day, slots in run_slots.items():
+            all_slots[day] = slots
+            if on_day:
+                on_day(day, slots, target_tz)
+    return target_tz, all_slots
+
+def prefetch_events(calendar_name, days=PREFETCH_DAYS):
+    """Load the coming days of a calendar into the caches in the background
+    
+    Fills the in-memory cache and the persistent free/busy index, so the
+    next launch can answer these days without querying the calendar.
+    
+    Returns:
+        Future: Resolves once the days are cached
+    """
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    return _get_executor().submit(get_events_for_dates, calendar_name, [today, today + timedelta(days=days - 1)])
+
+def iter_days(start, end=None):
+    """Yield consecutive days from start through end (inclusive), or forever"""
+    for offset in count():
+        day = start + timedelta(days=offset)
+        if end is not None and day.date() > end.date():
+            return
+        yield day
+
+def iter_available_slots(calendars, date_range, working_hours, duration_minutes=60, target_tz=None,
+                         limit=None, chunk_days=MAX_DAYS_PER_FETCH):
+    """Lazily yield available slots in chronological order
+    
+    Dates are taken from date_range a chunk at a time; each chunk's runs of
+    consecutive days are fetched concurrently and swept once. Nothing past
+    the current chunk is fetched, so stopping early (or passing limit) also
+    stops the calendar queries.
+    
+    Args:
+        calendars (str or list): Calendar name(s); with several, a slot must
+            be free in all of them
+        date_range (iterable): Dates (datetime) in ascending order, e.g. from
+            iter_days; may be unbounded if limit is given or the caller stops
+        limit (int): Stop after this many slots
+        chunk_days (int): Dates fetched and computed together
+        
+    Yields:
+        tuple: (date, (start, end)) with start and end in the display timezone
+    """
+    return _iter_slots_in_chunks(
+        calendars, _fixed_chunks(date_range, chunk_days), working_hours, duration_minutes, target_tz, limit
+    )
+
+def _fixed_chunks(date_range, chunk_days):
+    """Split an iterable of dates into lists of at most chunk_days dates"""
+    dates = iter(date_range)
+    while True:
+        chunk = list(islice(dates, chunk_days))
+        if not chunk:
+            return
+        yield chunk
+
+def _iter_slots_in_chunks(calendars, date_chunks, working_hours, duration_minutes, target_tz, limit):
+    """Fetch and sweep each chunk of dates in turn, yielding its slots in order"""
+    if limit is not None and limit <= 0:
+        return
+    executor = _get_executor()
+    found = 0
+    for chunk in date_chunks:
+        fetches = [
+            (run, executor.submit(get_events_for_dates, calendars, run, working_hours))
+            for run in _date_runs(chunk)
+        ]
+        try:
+            for run, future in fetches:
+                run_slots = get_available_slots_multi_day(
+                    future.result(), run, working_hours, duration_minutes, target_tz
+                )
+                for day in sorted(run_slots):
+                    for slot in run_slots[day]:
+                        yield day, slot
+                        found += 1
+                        if limit is not None and found >= limit:
+                            return
+        finally:
+            # Runs not reached yet are not needed once the caller stops
+            for _, future in fetches:
+                future.cancel()
+
+def find_next_slots(calendars, slot_count, working_hours, duration_minutes=60, target_tz=None, start=None,
+                    working_days=None):
+    """Find the earliest available slots without knowing the dates in advance
+    
+    Searches windows of growing size (1 day, 3 days, a week, ... as in
+    LOOKAHEAD_DAYS) until enough slots are found, so the common case costs a
+    single small query. Non-working days are never queried.
+    
+    Args:
+        calendars (str or list): Calendar name(s); with several, a slot must
+            be free in all of them
+        slot_count (int): Number of slots to find
+        start (datetime): First day to search; defaults to tomorrow
+        working_days (list): Weekdays to search (Monday=0); defaults to the
+            working_days config value
+        
+    Returns:
+        list: Up to slot_count (date, (start, end)) tuples in chronological
+            order; fewer if the horizon runs out
+    """
+    if start is None:
+        start = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+    if working_days is None:
+        working_days = get_working_days(load_config())
+    return list(_iter_slots_in_chunks(
+        calendars, _lookahead_chunks(start, working_days), working_hours, duration_minutes, target_tz, slot_count
+    ))
+
+def get_working_days(config):
+    """Return the configured working weekdays, Monday to Friday by default"""
+    return config.get('working_days', DEFAULT_CONFIG['working_days'])
+
+def _lookahead_chunks(start, working_days):
+    """Yield the working days of each successive LOOKAHEAD_DAYS window after start"""
+    working_days = set(working_days)
+    searched = 0
+    for horizon in LOOKAHEAD_DAYS:
+        chunk = [
+            day for day in (start + timedelta(days=offset) for offset in range(searched, horizon))
+            if day.weekday() in working_days
+        ]
+        searched = horizon
+        if chunk:
+            yield chunk
+
+def group_slots_by_date(slots):
+    """Turn (date, slot) tuples into the date -> slots dict used by the formatters"""
+    all_slots = {}
+    for day, slot in slots:
+        all_slots.setdefault(day, []).append(slot)
+    return all_slots
+
+def _is_overnight(working_hours):
+    """Check whether working hours end on the next day (e.g. 22:00-06:00)"""
+    start_hour, start_minute = (int(part) for part in working_hours['start'].split(':'))
+    end_hour, end_minute = (int(part) for part in working_hours['end'].split(':'))
+    return (end_hour, end_minute) <= (start_hour, start_minute)
+
+def _working_window(target_date, working_hours, target_tz):
+    """Return the working day of target_date as epoch minutes plus the display timezone
+    
+    Working hours are wall-clock times in the machine's local zone; hours
+    ending at or before their start run into the next day. The conversions
+    are memoized per day, so repeated checks are free.
+    """
+    day = target_date.date()
+    end_day = day + timedelta(days=1) if _is_overnight(working_hours) else day
+    day_start = wall_time_to_epoch(day, working_hours['start'])
+    day_end = wall_time_to_epoch(end_day, working_hours['end'])
+    return day_start // 60, day_end // 60, get_zone(target_tz)
+
+def _busy_stream(busy_lists):
+    """Merge busy periods into one sorted, disjoint epoch-minute stream
     
-    # Filter slots that are too short for the desired duration
-    duration = timedelta(minutes=duration_minutes)
-    valid_slots = []
-    for start, end in available_slots:
-        slot_duration = end - start
-        if slot_duration >= duration:
-            valid_slots.append((start, end))
+    Events spanning several days are listed under every day they overlap;
+    merging collapses those copies.
     
-    return valid_slots
+    Args:
+        busy_lists (iterable): BusyIntervals (or lists of (start, end) datetimes)
+        
+    Returns:
+        tuple: (starts, ends) as array('q') columns, see merge_intervals
+    """
+    busy_starts = array('q')
+    busy_ends = array('q')
+    for busy_periods in busy_lists:
+        if not isinstance(busy_periods, BusyIntervals):
+            busy_periods = BusyIntervals.from_datetimes(busy_periods)
+        starts, ends = busy_periods.timed_columns()
+        busy_starts.extend(start_ts // 60 for start_ts in starts)
+        busy_ends.extend(-(-end_ts // 60) for end_ts in ends)  # Round partial minutes up
+    return merge_intervals(busy_starts, busy_ends)
+
+def _clip_to_window(busy_starts, busy_ends, window_start, window_end):
+    """Return the part of a merged busy stream that overlaps a window"""
+    first = bisect_right(busy_ends, window_start)
+    last = bisect_left(busy_starts, window_end)
+    return busy_starts[first:last], busy_ends[first:last]
+
+def _slots_from_gaps(gaps, target_zone):
+    """Convert epoch-minute gaps to datetime slots in the display timezone"""
+    times = to_datetimes([minute * 60 for gap in gaps for minute in gap], target_zone)
+    return list(zip(times[::2], times[1::2]))
 
 def format_slots_for_email(slots, timezone="Local Time"):
     """Format available slots into email-friendly text"""
@@ -150,26 +516,14 @@ def get_target_date():
         except ValueError:
             print("Please enter a valid date in YYYY-MM-DD format")
 
+@traced('geocode')
 def get_location_timezone(location):
-    """Convert a location name to a timezone using geopy and timezonefinder"""
-    from geopy.geocoders import Nominatim
-    from timezonefinder import TimezoneFinder
-
-    try:
-        # Initialize the geocoder with a unique user agent
-        geolocator = Nominatim(user_agent="meeting_coordinator")
-        tf = TimezoneFinder()
-
-        # Get location coordinates
-        location_data = geolocator.geocode(location)
-        if location_data is None:
-            return None
-
-        # Get timezone from coordinates
-        timezone_str = tf.timezone_at(lat=location_data.latitude, lng=location_data.longitude)
-        return timezone_str
-    except Exception:
-        return None
+    """Convert a location name to a timezone using geopy and timezonefinder
+    
+    Delegates to the process-wide TimezoneResolver, which checks the offline
+    gazetteer and the geocode cache before going to the network.
+    """
+    return TimezoneResolver.get_instance().resolve(location)
 
 def get_target_timezone():
     """Ask user for the target timezone using natural language"""
@@ -183,17 +537,38 @@ def get_target_timezone():
             
         # Try to get timezone from location
         timezone_str = get_location_timezone(location)
-        if timezone_str:
-            try:
-                # Verify the timezone is valid
-                pytz.timezone(timezone_str)
-                return timezone_str
-            except pytz.exceptions.UnknownTimeZoneError:
-                pass
+        # Verify the timezone is valid
+        if timezone_str and is_valid_zone(timezone_str):
+            return timezone_str
         
         print("Location not found. Please try another location or 'local' for local time.")
         continue
 
+def get_search_mode():
+    """Ask whether to check specific dates or search for the next free slots"""
+    while True:
+        print("\nWhat would you like to do?")
+        print("1. Check specific dates")
+        print("2. Find the next available slots")
+        choice = input("Choice (1-2): ")
+        if choice == "1":
+            return "dates"
+        if choice == "2":
+            return "next"
+        print("Please enter 1 or 2")
+
+def get_slot_count():
+    """Ask user how many slots to search for"""
+    while True:
+        try:
+            count = int(input("\nHow many slots should I find? (e.g., 3, 5): "))
+            if count <= 0:
+                print("Number of slots must be positive")
+                continue
+            return count
+        except ValueError:
+            print("Please enter a valid number")
+
 def get_target_dates():
     """Ask user for target dates"""
     dates = []
@@ -231,6 +606,7 @@ def get_target_dates():
         except ValueError:
             print("Please enter a valid date in YYYY-MM-DD format")
 
+@traced('format')
 def format_multiple_days_email(all_slots, timezone="Local Time"):
     """Format available slots for multiple days into a concise text"""
     if not all_slots:
@@ -286,30 +662,58 @@ def main():
     # Get desired meeting duration
     duration = get_meeting_duration()
     
+    try:
+        _print_available_slots(config, duration)
+    except CalendarAccessError as e:
+        print(f"\nCould not read calendar: {str(e)}")
+
+def _print_available_slots(config, duration):
+    """Ask for the dates or slot count and print the available slots"""
+    if get_search_mode() == "next":
+        slot_count = get_slot_count()
+        target_tz = get_target_timezone()
+        print(f"\nSearching for the next {slot_count} {duration}-minute slots...")
+        next_slots = find_next_slots(
+            config['selected_calendar'],
+            slot_count,
+            config['working_hours'],
+            duration,
+            target_tz,
+            working_days=get_working_days(config)
+        )
+        print("\nAvailable slots:")
+        print(format_multiple_days_email(group_slots_by_date(next_slots), target_tz))
+        return
+    
     # Get target dates
     target_dates = get_target_dates()
     
+    # Start the calendar fetch while the user picks a location
+    fetches = fetch_events_async(config['selected_calendar'], target_dates, config['working_hours'])
+    
     # Get target timezone
     target_tz = get_target_timezone()
     
     print(f"\nLooking for {duration}-minute slots...")
     
-    all_available_slots = {}
-    for target_date in target_dates:
-        print(f"\nChecking availability for {target_date.strftime('%Y-%m-%d')}...")
-        available_slots = get_available_slots(
-            config['selected_calendar'],
-            target_date,
-            config['working_hours'],
-            duration,
-            target_tz
-        )
-        all_available_slots[target_date.date()] = available_slots
+    print(f"\nChecking availability for {', '.join(d.strftime('%Y-%m-%d') for d in target_dates)}...")
+    _, all_available_slots = collect_available_slots(
+        config['selected_calendar'],
+        target_dates,
+        config['working_hours'],
+        duration,
+        target_tz,
+        fetches=fetches
+    )
     
     print("\nAvailable slots:")
     print(format_multiple_days_email(all_available_slots, target_tz))
 
 if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run(sys.argv[1:]))
     main()
 
 
@@ -0,0 +1,230 @@
+"""Recurring event expansion
+
+Expands a recurring event (DTSTART plus RRULE, RDATE and EXDATE) into the
+occurrences overlapping a time range, without walking the series from its
+start. DAILY and WEEKLY rules using only INTERVAL, COUNT, UNTIL, BYDAY and
+WKST are solved in closed form: the first candidate occurrence in the range
+is computed directly, and COUNT is checked against each candidate's ordinal.
+Other rules are expanded with dateutil.
+
+Occurrences repeat at the same wall-clock time in the series' timezone, so
+they follow DST changes. Expansions are memoized per (series, range).
+"""
+import math
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+
+from dateutil.rrule import rrulestr
+
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+CLOSED_FORM_PARTS = frozenset(('FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'WKST'))
+MEMO_SIZE = 4096  # Memoized (series, range) expansions
+
+
+def wall_timestamp(wall, zone=None):
+    """Epoch seconds of a naive wall-clock time in zone (None: local time)"""
+    if zone is None:
+        return wall.timestamp()
+    return wall.replace(tzinfo=zone).timestamp()
+
+
+def parse_rrule(value):
+    """Split an RRULE value into {part: value}, e.g. {'FREQ': 'WEEKLY', 'BYDAY': 'MO,WE'}"""
+    parts = {}
+    for item in value.strip().split(';'):
+        key, _, part_value = item.partition('=')
+        if key.strip():
+            parts[key.strip().upper()] = part_value.strip().upper()
+    return parts
+
+
+class RecurringSeries:
+    """One recurring event
+
+    Args:
+        dtstart (datetime): Naive wall-clock start of the first occurrence
+        duration (float): Length of each occurrence in seconds
+        rrule (str): RRULE value, or None for a series of RDATEs only
+        rdates (iterable): Extra (start_ts, end_ts) occurrences
+        exdates (iterable): Epoch-second starts of excluded occurrences
+        zone (tzinfo): Timezone of dtstart; None for floating (local) time
+
+    Raises:
+        ValueError: If the rule cannot be parsed
+    """
+
+    def __init__(self, dtstart, duration, rrule=None, rdates=(), exdates=(), zone=None):
+        self.dtstart = dtstart
+        self.zone = zone
+        self.duration = math.ceil(duration)
+        self.start_ts = math.floor(wall_timestamp(dtstart, zone))
+        self.rdates = tuple(sorted((math.floor(start), math.ceil(end)) for start, end in rdates))
+        self.exdates = {math.floor(start) for start in exdates}
+        self.rrule_text = rrule
+        self.rule = parse_rrule(rrule) if rrule else None
+        self._dateutil_rule = None
+
+        self.count = self.until_ts = None
+        if self.rule is None:
+            return
+        freq = self.rule.get('FREQ')
+        if freq not in ('SECONDLY', 'MINUTELY', 'HOURLY', 'DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'):
+            raise ValueError(f"Invalid FREQ in RRULE: {rrule}")
+        self.interval = int(self.rule.get('INTERVAL', 1))
+        if self.interval < 1:
+            raise ValueError(f"Invalid INTERVAL in RRULE: {rrule}")
+        if 'COUNT' in self.rule:
+            self.count = int(self.rule['COUNT'])
+        if 'UNTIL' in self.rule:
+            self.until_ts = self._parse_until(self.rule['UNTIL'])
+
+        days = self.rule['BYDAY'].split(',') if 'BYDAY' in self.rule else []
+        self.closed_form = (
+            freq in ('DAILY', 'WEEKLY')
+            and set(self.rule) <= CLOSED_FORM_PARTS
+            and all(day in WEEKDAYS for day in days)
+            and self.rule.get('WKST', 'MO') in WEEKDAYS
+        )
+        if not self.closed_form:
+            self._get_dateutil_rule()  # Validate now rather than on the first query
+            return
+        self.weekdays = sorted({WEEKDAYS.index(day) for day in days}) or None
+        self.week_start = WEEKDAYS.index(self.rule.get('WKST', 'MO'))
+        if freq == 'DAILY' and self.weekdays:
+            # Weekdays of days origin + k * interval repeat with this period
+            period = 7 // math.gcd(self.interval, 7)
+            self._daily_matches = [0]
+            for k in range(period):
+                day = dtstart.date() + timedelta(days=k * self.interval)
+                self._daily_matches.append(self._daily_matches[-1] + (day.weekday() in self.weekdays))
+
+    def _parse_until(self, value):
+        if len(value) == 8:
+            # A DATE includes the whole day
+            return wall_timestamp(datetime.strptime(value, '%Y%m%d') + timedelta(days=1), self.zone) - 1
+        wall = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+        if value.endswith('Z'):
+            return wall.replace(tzinfo=timezone.utc).timestamp()
+        return wall_timestamp(wall, self.zone)
+
+    def _get_dateutil_rule(self):
+        if self._dateutil_rule is None:
+            # UNTIL is applied by the caller, so naive and UTC values need no reconciling
+            text = ';'.join(f"{key}={value}" for key, value in self.rule.items() if key != 'UNTIL')
+            self._dateutil_rule = rrulestr(f"RRULE:{text}", dtstart=self.dtstart)
+        return self._dateutil_rule
+
+    def _wall(self, ts):
+        if self.zone is None:
+            return datetime.fromtimestamp(ts)
+        return datetime.fromtimestamp(ts, self.zone).replace(tzinfo=None)
+
+    def base_key(self):
+        """Everything defining the series except its exclusions"""
+        return (self.dtstart, str(self.zone), self.duration, self.rrule_text, self.rdates)
+
+    def exclude(self, start_ts):
+        """Drop the occurrence starting at start_ts, e.g. one replaced by an override
+
+        Must be called before the series is first queried.
+        """
+        self.exdates.add(math.floor(start_ts))
+
+    def bounds(self):
+        """Return (first_start_ts, last_end_ts); last_end_ts is None if the series never ends"""
+        first = min((self.start_ts,) + tuple(start for start, _ in self.rdates))
+        last = max((self.start_ts + self.duration,) + tuple(end for _, end in self.rdates))
+        if self.rule is None:
+            return first, last
+        if self.until_ts is not None:
+            return first, max(last, math.ceil(self.until_ts) + self.duration)
+        if self.count is not None:
+            occurrences = list(self._get_dateutil_rule())
+            if occurrences:
+                last = max(last, math.ceil(wall_timestamp(occurrences[-1], self.zone)) + self.duration)
+            return first, last
+        return first, None
+
+    def occurrences(self, range_start, range_end):
+        """Return (start_ts, end_ts) of occurrences overlapping [range_start, range_end], sorted"""
+        return _expand(self, range_start, range_end)
+
+    def rule_days(self, first_day, last_day):
+        """Yield wall-clock starts of the rule's occurrences on first_day..last_day
+
+        Only the rule is applied here, not UNTIL, RDATE or EXDATE.
+        """
+        if not self.closed_form:
+            yield from self._get_dateutil_rule().between(
+                datetime.combine(first_day, time.min), datetime.combine(last_day, time.max), inc=True
+            )
+            return
+        start_time = self.dtstart.time()
+        days = self._daily(first_day, last_day) if self.rule['FREQ'] == 'DAILY' else self._weekly(first_day, last_day)
+        for day in days:
+            yield datetime.combine(day, start_time)
+
+    def _daily(self, first_day, last_day):
+        origin = self.dtstart.date()
+        first = max(0, -(-(first_day - origin).days // self.interval))
+        last = (last_day - origin).days // self.interval
+        for k in range(first, last + 1):
+            day = origin + timedelta(days=k * self.interval)
+            if self.weekdays is None:
+                ordinal = k
+            elif day.weekday() in self.weekdays:
+                # Matches among indexes 0..k-1: whole periods, then the remainder
+                period = len(self._daily_matches) - 1
+                ordinal = (k // period) * self._daily_matches[-1] + self._daily_matches[k % period]
+            else:
+                continue
+            if self.count is not None and ordinal >= self.count:
+                return
+            yield day
+
+    def _weekly(self, first_day, last_day):
+        origin = self.dtstart.date()
+        week_origin = origin - timedelta(days=(origin.weekday() - self.week_start) % 7)
+        weekdays = self.weekdays or [origin.weekday()]
+        offsets = sorted((weekday - self.week_start) % 7 for weekday in weekdays)
+        # The first week only has the days from DTSTART on
+        first_week_offsets = [offset for offset in offsets if week_origin + timedelta(days=offset) >= origin]
+
+        first = max(0, (first_day - week_origin).days // 7)
+        first = -(-first // self.interval) * self.interval
+        last = (last_day - week_origin).days // 7
+        for week in range(first, last + 1, self.interval):
+            if week == 0:
+                week_offsets, ordinal = first_week_offsets, 0
+            else:
+                week_offsets = offsets
+                ordinal = len(first_week_offsets) + (week // self.interval - 1) * len(offsets)
+            week_start = week_origin + timedelta(days=7 * week)
+            for position, offset in enumerate(week_offsets):
+                if self.count is not None and ordinal + position >= self.count:
+                    return
+                day = week_start + timedelta(days=offset)
+                if first_day <= day <= last_day:
+                    yield day
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _expand(series, range_start, range_end):
+    occurrences = set()
+    if series.start_ts <= range_end:
+        # DTSTART is always the first occurrence
+        occurrences.add((series.start_ts, series.start_ts + series.duration))
+        if series.rule is not None and (series.until_ts is None or range_start - series.duration <= series.until_ts):
+            first_day = series._wall(range_start - series.duration).date() - timedelta(days=1)
+            last_day = series._wall(range_end).date() + timedelta(days=1)
+            for wall in series.rule_days(first_day, last_day):
+                start_ts = math.floor(wall_timestamp(wall, series.zone))
+                if series.until_ts is not None and start_ts > series.until_ts:
+                    break
+                occurrences.add((start_ts, start_ts + series.duration))
+    occurrences.update(series.rdates)
+    return tuple(sorted(
+        (start_ts, end_ts) for start_ts, end_ts in occurrences
+        if start_ts not in series.exdates and start_ts <= range_end
+        and (end_ts > range_start or start_ts >= range_start)
+    ))
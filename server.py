@@ -0,0 +1,209 @@
+"""Local HTTP availability service
+
+Usage: python3 server.py [--host 127.0.0.1] [--port 8765]
+
+Serves the slot engine to scripts and bots without the GUI:
+
+    GET /availability?dates=2025-03-03,2025-03-04&duration=30&tz=Europe/London
+    GET /availability?range=2025-03-03:2025-03-14&calendar=Work&calendar=Home
+    GET /availability?next=5&duration=60
+    GET /health
+
+Query parameters match the command line options (see cli.py); tz may be an
+IANA zone or a location name. Responses are the JSON of `--format json`.
+
+The process keeps the calendar backend, its day cache and the timezone
+resolver warm between requests; the configuration is re-read from the
+ConfigStore on every query, so changes made in Settings apply at once.
+Connections are HTTP/1.1 keep-alive, and
+each query is computed on a thread pool so slow calendar queries do not
+block other connections.
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from cli import QueryError, format_json, run_query
+from config import load_config
+from main import CalendarAccessError, TimezoneLookupError, prefetch_events
+from timezone_resolver import TimezoneResolver
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_QUERY_WORKERS = 8
+IDLE_TIMEOUT = 15  # Seconds a keep-alive connection may sit idle
+MAX_HEADER_LINES = 100
+MAX_DISCARDED_BODY = 64 * 1024  # Larger request bodies close the connection instead
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def query_from_params(params):
+    """Turn URL query parameters into a query dict (see cli.run_query)"""
+    query = {'calendar': params.get('calendar')}
+    for key in ('dates', 'range', 'hours'):
+        if key in params:
+            query[key] = params[key][-1]
+    if 'tz' in params or 'location' in params:
+        query['location'] = (params.get('tz') or params['location'])[-1]
+    for key in ('duration', 'next'):
+        if key in params:
+            try:
+                query[key] = int(params[key][-1])
+            except ValueError:
+                raise QueryError(f"'{key}' must be a whole number")
+    return query
+
+
+class AvailabilityServer:
+    """asyncio HTTP/1.1 server answering availability queries"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=MAX_QUERY_WORKERS, thread_name_prefix="availability-http")
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it or goes idle"""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                headers = await self._read_headers(reader)
+                if headers is None:
+                    break
+
+                method, target, version = self._parse_request_line(request_line)
+                # No route takes a body; drop it so it is not read as the next request
+                keep_alive = self._keep_alive(version, headers) and await self._discard_body(reader, headers)
+                if method is None:
+                    status, body = 400, {'error': 'Malformed request line'}
+                    keep_alive = False
+                else:
+                    status, body = await self.dispatch(method, target)
+
+                self._write_response(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(self, reader):
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if not line:
+                return None
+            if line in (b'\r\n', b'\n'):
+                return headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return None
+
+    async def _discard_body(self, reader, headers):
+        """Read and drop a request body
+
+        Returns:
+            bool: False if the body could not be skipped and the connection must close
+        """
+        if 'transfer-encoding' in headers:
+            return False
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return False
+        if not 0 <= length <= MAX_DISCARDED_BODY:
+            return False
+        if length:
+            await reader.readexactly(length)
+        return True
+
+    def _parse_request_line(self, line):
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            return None, None, None
+        return parts
+
+    def _keep_alive(self, version, headers):
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def _write_response(self, writer, status, body, keep_alive):
+        payload = body if isinstance(body, str) else json.dumps(body)
+        data = payload.encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + data)
+
+    async def dispatch(self, method, target):
+        """Route a request
+
+        Returns:
+            tuple: (HTTP status, JSON body as a str or dict)
+        """
+        url = urlsplit(target)
+        if url.path == '/health':
+            return 200, {'status': 'ok'}
+        if url.path != '/availability':
+            return 404, {'error': f"No route for {url.path}"}
+        if method != 'GET':
+            return 405, {'error': 'Only GET is supported'}
+
+        try:
+            query = query_from_params(parse_qs(url.query))
+            loop = asyncio.get_running_loop()
+            target_tz, all_slots = await loop.run_in_executor(self.executor, self._run_query, query)
+            return 200, format_json(all_slots, target_tz)
+        except (QueryError, TimezoneLookupError) as e:
+            return 400, {'error': str(e)}
+        except CalendarAccessError as e:
+            return 404, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f"An error occurred: {str(e)}"}
+
+    def _run_query(self, query):
+        # Per request, so Settings changes reach a running server; ConfigStore
+        # only re-reads the file when it changed
+        return run_query(query, load_config())
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"Serving availability on http://{self.host}:{self.port}/availability")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve meeting availability over HTTP')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Interface to bind (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to bind (default: {DEFAULT_PORT})')
+    args = parser.parse_args()
+
+    # Load the timezone data and the coming weeks of events before the first request needs them
+    TimezoneResolver.get_instance().warm_up()
+    selected_calendar = load_config().get('selected_calendar')
+    if selected_calendar:
+        prefetch_events(selected_calendar)
+    try:
+        asyncio.run(AvailabilityServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,12 @@ APP = ['gui.py']
 DATA_FILES = [
     ('resources', ['resources/icon_64x64.png', 'resources/icon_128x128.png', 
                   'resources/calendar-search.png', 'resources/settings.png', 
-                  'resources/log-out.png'])
+                  'resources/log-out.png', 'resources/gazetteer.tsv'])
 ]
 OPTIONS = {
     'argv_emulation': True,
     'argv_emulation': True,
-    'packages': ['PyQt5', 'pytz', 'geopy', 'timezonefinder'],
+    'packages': ['PyQt5', 'geopy', 'timezonefinder'],
     'includes': ['Foundation', 'EventKit'],
     'excludes': ['pkg_resources', 'setuptools'], 
     'iconfile': 'resources/icon.icns',
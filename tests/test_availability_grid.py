@@ -0,0 +1,36 @@
+"""Randomized comparison of the NumPy grid with the sweep engine"""
+import random
+
+import pytest
+
+from intervals import free_gaps_in_windows, merge_intervals
+from test_intervals import columns, random_busy
+
+np = pytest.importorskip('numpy')
+from availability_grid import free_runs_grid  # noqa: E402
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_grid_matches_sweep(seed):
+    rng = random.Random(seed)
+    window_starts, window_ends = [], []
+    start = rng.randint(0, 1000)
+    for _ in range(rng.randint(1, 10)):
+        window_starts.append(start)
+        window_ends.append(start + rng.randint(1, 900))
+        start += 1440
+    busy = random_busy(rng, window_starts[0], window_ends[-1], rng.randint(0, 80))
+    min_length = rng.choice((1, 15, 30, 60))
+
+    merged_starts, merged_ends = merge_intervals(*columns(busy))
+    expected = free_gaps_in_windows(window_starts, window_ends, merged_starts, merged_ends, min_length)
+    # The grid takes raw, unmerged intervals in any order
+    assert free_runs_grid(window_starts, window_ends, *columns(busy), min_length=min_length) == expected
+
+
+def test_granularity_rounds_busy_time_out_to_cells():
+    assert free_runs_grid([0], [120], [20], [50], granularity=15) == [[(0, 15), (60, 120)]]
+
+
+def test_no_windows():
+    assert free_runs_grid([], [], [1], [2]) == []
@@ -0,0 +1,64 @@
+"""Machine-readable output of the command line interface"""
+import json
+from datetime import datetime
+
+import pytest
+
+import calendar_backend
+import cli
+import config
+from calendar_backend import MemoryCalendarBackend
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    # No config file, so the store reports its defaults
+    monkeypatch.setattr(config.ConfigStore, '_instance', config.ConfigStore(str(tmp_path / 'config.json')))
+    memory = MemoryCalendarBackend()
+    day = datetime(2025, 3, 4)
+    memory.set_events('Work', [day.replace(hour=10).timestamp()], [day.replace(hour=11).timestamp()])
+    calendar_backend.set_backend(memory)
+    yield memory
+    calendar_backend.set_backend(None)
+
+
+def test_json_output_is_parseable(backend, capsys):
+    assert cli.run(['--calendar', 'Work', '--dates', '2025-03-04', '--hours', '09:00-17:00',
+                    '--format', 'json']) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert list(result['slots']) == ['2025-03-04']
+
+
+def test_ics_output_is_a_calendar(backend, capsys):
+    assert cli.run(['--calendar', 'Work', '--dates', '2025-03-04', '--format', 'ics']) == 0
+    output = capsys.readouterr().out
+    assert output.startswith('BEGIN:VCALENDAR') and output.rstrip().endswith('END:VCALENDAR')
+
+
+def test_missing_calendar_is_reported_on_stderr(backend, capsys):
+    assert cli.run(['--calendar', 'Nope', '--dates', '2025-03-04', '--format', 'json']) == 1
+    captured = capsys.readouterr()
+    assert captured.out == '' and 'Nope' in captured.err
+
+
+def test_batch_reports_malformed_queries_and_continues(backend, tmp_path, capsys):
+    batch = tmp_path / 'queries.jsonl'
+    batch.write_text('\n'.join([
+        '{"id": "types", "dates": 5}',
+        '{"id": "hours", "hours": 5, "dates": "2025-03-04"}',
+        '{"id": "zero", "duration": 0, "dates": "2025-03-04"}',
+        '{"id": "bool", "duration": true, "dates": "2025-03-04"}',
+        '{"id": "list", "dates": ["2025-03-04", 7]}',
+        '{"id": "ok", "dates": ["2025-03-04"], "duration": 30}',
+    ]) + '\n')
+    assert cli.run(['--calendar', 'Work', '--batch', str(batch), '--format', 'json']) == 1
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [result['id'] for result in results] == ['types', 'hours', 'zero', 'bool', 'list', 'ok']
+    assert all('error' in result for result in results[:-1])
+    assert list(results[-1]['slots']) == ['2025-03-04']
+
+
+def test_zero_duration_is_rejected(backend, capsys):
+    with pytest.raises(SystemExit):
+        cli.run(['--calendar', 'Work', '--dates', '2025-03-04', '--duration', '0'])
+    assert 'Duration' in capsys.readouterr().err
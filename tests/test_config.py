@@ -0,0 +1,66 @@
+"""ConfigStore caching and debounced writes"""
+import json
+import os
+import time
+
+import pytest
+
+from config import DEFAULT_CONFIG, ConfigStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ConfigStore(str(tmp_path / 'config.json'), save_delay=60)
+    yield store
+    store.flush()
+
+
+def read_file(store):
+    with open(store.path) as f:
+        return json.load(f)
+
+
+def test_missing_file_gives_defaults(store):
+    assert store.load() == DEFAULT_CONFIG
+    assert not os.path.exists(store.path)
+
+
+def test_load_returns_a_copy(store):
+    store.load()['working_hours']['start'] = '06:00'
+    assert store.load()['working_hours']['start'] == DEFAULT_CONFIG['working_hours']['start']
+
+
+def test_saves_are_kept_in_memory_until_flushed(store):
+    for calendar in ('A', 'B', 'C'):
+        store.save({**DEFAULT_CONFIG, 'selected_calendar': calendar})
+    assert store.load()['selected_calendar'] == 'C'
+    assert not os.path.exists(store.path)
+
+    store.flush()
+    assert read_file(store)['selected_calendar'] == 'C'
+    # Only the config itself is left; the temporary file was renamed over it
+    assert os.listdir(os.path.dirname(store.path)) == ['config.json']
+
+
+def test_debounced_save_is_written(tmp_path):
+    store = ConfigStore(str(tmp_path / 'config.json'), save_delay=0.01)
+    store.save({**DEFAULT_CONFIG, 'last_location': 'Berlin'})
+    deadline = time.monotonic() + 5
+    while not os.path.exists(store.path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert read_file(store)['last_location'] == 'Berlin'
+
+
+def test_external_changes_are_reread(store):
+    store.save({**DEFAULT_CONFIG, 'last_location': 'Berlin'})
+    store.flush()
+    with open(store.path, 'w') as f:
+        json.dump({**DEFAULT_CONFIG, 'last_location': 'Lisbon, Portugal'}, f)
+    assert store.load()['last_location'] == 'Lisbon, Portugal'
+
+
+def test_pending_save_wins_over_file(store):
+    with open(store.path, 'w') as f:
+        json.dump({**DEFAULT_CONFIG, 'last_location': 'On disk'}, f)
+    store.save({**DEFAULT_CONFIG, 'last_location': 'Pending'})
+    assert store.load()['last_location'] == 'Pending'
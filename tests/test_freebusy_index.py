@@ -0,0 +1,73 @@
+"""Free/busy index persistence and staleness"""
+from datetime import datetime
+
+import pytest
+
+import freebusy_index
+from calendar_backend import BusyIntervals, day_span
+from freebusy_index import FreeBusyIndex
+
+DAY = datetime(2025, 3, 4)
+
+
+def ts(hour, minute=0):
+    return DAY.replace(hour=hour, minute=minute).timestamp()
+
+
+def busy_day():
+    intervals = BusyIntervals()
+    intervals.append(int(ts(10)), int(ts(11)))
+    return {DAY.date(): intervals}
+
+
+def write(index, signature=None):
+    span_start, span_end = day_span(DAY, DAY)
+    index.write_span('Work', span_start, span_end, busy_day(), signature)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000_000.0]
+    monkeypatch.setattr(freebusy_index.time, 'time', lambda: now[0])
+    return now
+
+
+def test_round_trip_across_instances(tmp_path):
+    write(FreeBusyIndex(str(tmp_path)), signature=['Work', 1, 2])
+    days = FreeBusyIndex(str(tmp_path)).read_days('Work', [DAY.date()], ['Work', 1, 2])
+    assert list(days[DAY.date()]) == [(DAY.replace(hour=10), DAY.replace(hour=11))]
+
+
+def test_signature_change_discards_index(tmp_path):
+    write(FreeBusyIndex(str(tmp_path)), signature=['Work', 1, 2])
+    assert FreeBusyIndex(str(tmp_path)).read_days('Work', [DAY.date()], ['Work', 1, 3]) == {}
+
+
+def test_signed_index_does_not_expire(tmp_path, clock):
+    write(FreeBusyIndex(str(tmp_path)), signature=['Work', 1, 2])
+    clock[0] += 30 * 86400
+    assert DAY.date() in FreeBusyIndex(str(tmp_path)).read_days('Work', [DAY.date()], ['Work', 1, 2])
+
+
+def test_unsigned_days_expire_after_max_age(tmp_path, clock):
+    index = FreeBusyIndex(str(tmp_path))
+    write(index)
+    clock[0] += freebusy_index.UNSIGNED_MAX_AGE - 1
+    assert DAY.date() in FreeBusyIndex(str(tmp_path)).read_days('Work', [DAY.date()])
+    clock[0] += 2
+    assert FreeBusyIndex(str(tmp_path)).read_days('Work', [DAY.date()]) == {}
+
+
+def test_unsigned_rewrite_refreshes_day(tmp_path, clock):
+    index = FreeBusyIndex(str(tmp_path))
+    write(index)
+    clock[0] += freebusy_index.UNSIGNED_MAX_AGE + 1
+    write(index)
+    assert DAY.date() in index.read_days('Work', [DAY.date()])
+
+
+def test_invalidate_range_forgets_days(tmp_path):
+    index = FreeBusyIndex(str(tmp_path))
+    write(index, signature=['Work', 1, 2])
+    index.invalidate_range('Work', ts(10), ts(11))
+    assert index.read_days('Work', [DAY.date()], ['Work', 1, 2]) == {}
@@ -0,0 +1,61 @@
+"""Offline location resolution from the bundled gazetteer"""
+import zoneinfo
+
+import pytest
+
+from gazetteer import GAZETTEER_FILE, Gazetteer
+
+
+@pytest.fixture(scope='module')
+def gazetteer():
+    return Gazetteer()
+
+
+@pytest.mark.parametrize('location, zone', [
+    ('London', 'Europe/London'),
+    ('london, uk', 'Europe/London'),
+    ('Portland, OR', 'America/Los_Angeles'),
+    ('Portland, Oregon', 'America/Los_Angeles'),
+    ('Portland, ME', 'America/New_York'),
+    ('Portland, Maine', 'America/New_York'),
+    ('Toronto, ON', 'America/Toronto'),
+    ('Sydney, NSW', 'Australia/Sydney'),
+    ('Sydney, Australia', 'Australia/Sydney'),
+    ('New York, NY, USA', 'America/New_York'),
+    ('LA', 'America/Los_Angeles'),
+    ('PST', 'America/Los_Angeles'),
+    ('Japan', 'Asia/Tokyo'),
+    ('europe/berlin', 'Europe/Berlin'),
+])
+def test_resolves_known_locations(gazetteer, location, zone):
+    assert gazetteer.resolve(location) == zone
+
+
+@pytest.mark.parametrize('location', [
+    'Portland',  # Oregon or Maine
+    'Portland, USA',
+    'Vancouver, WA',  # The city we know is in British Columbia
+    'Cambridge, MA',  # Only Cambridge, England is bundled
+    'Springfield, IL',
+    'London, Kentucky County',
+    'Atlantis',
+    '',
+])
+def test_leaves_unknown_or_ambiguous_locations_to_the_geocoder(gazetteer, location):
+    assert gazetteer.resolve(location) is None
+
+
+def test_index_is_sorted_and_well_formed():
+    zones = zoneinfo.available_timezones()
+    names = []
+    with open(GAZETTEER_FILE, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            name, kind, tz, country, region = line.rstrip('\n').split('\t')
+            assert kind in ('city', 'country', 'abbrev', 'region'), line
+            assert (kind == 'region') == (not tz), line
+            assert not tz or tz in zones, line
+            assert not region or region.startswith(country + '-'), line
+            names.append(name)
+    assert names == sorted(names)
@@ -0,0 +1,189 @@
+"""ICS parsing and the ICS calendar backend"""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import ics_backend
+from calendar_backend import CalendarAccessError
+from ics_backend import ICSCalendarBackend, iter_vevents, parse_ics_datetime, parse_ics_duration
+
+BERLIN = ZoneInfo('Europe/Berlin')
+
+CALENDAR = """BEGIN:VCALENDAR
+X-WR-CALNAME:Work
+BEGIN:VEVENT
+UID:utc
+DTSTART:20250304T080000Z
+DTEND:20250304T090000Z
+SUMMARY:A long summary that is folded
+  onto a second line
+END:VEVENT
+BEGIN:VEVENT
+UID:zoned
+DTSTART;TZID=Europe/Berlin:20250304T120000
+DURATION:PT30M
+BEGIN:VALARM
+TRIGGER:-PT15M
+DTSTART:20000101T000000Z
+END:VALARM
+END:VEVENT
+BEGIN:VEVENT
+UID:all-day
+DTSTART;VALUE=DATE:20250304
+DTEND;VALUE=DATE:20250305
+END:VEVENT
+BEGIN:VEVENT
+UID:cancelled
+DTSTART:20250304T100000Z
+DTEND:20250304T103000Z
+STATUS:CANCELLED
+END:VEVENT
+BEGIN:VEVENT
+UID:broken
+DTSTART:not-a-date
+END:VEVENT
+BEGIN:VEVENT
+UID:standup
+DTSTART;TZID=Europe/Berlin:20250303T090000
+DTEND;TZID=Europe/Berlin:20250303T091500
+RRULE:FREQ=DAILY;COUNT=5
+EXDATE;TZID=Europe/Berlin:20250305T090000
+END:VEVENT
+BEGIN:VEVENT
+UID:standup
+RECURRENCE-ID;TZID=Europe/Berlin:20250304T090000
+DTSTART;TZID=Europe/Berlin:20250304T100000
+DTEND;TZID=Europe/Berlin:20250304T101500
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def berlin(day, hour, minute=0):
+    return datetime(2025, 3, day, hour, minute, tzinfo=BERLIN).timestamp()
+
+
+def periods(events_by_day):
+    """All periods of a fetch, whatever local days the machine's timezone puts them on"""
+    found = set()
+    for intervals in events_by_day.values():
+        found.update(zip(*intervals.timed_columns()))
+    return sorted(found)
+
+
+def fetch(backend):
+    return periods(backend.get_events_for_range(['Work'], datetime(2025, 3, 1), datetime(2025, 3, 9)))
+
+
+@pytest.fixture
+def ics_path(tmp_path):
+    path = tmp_path / 'work.ics'
+    path.write_text(CALENDAR.replace('\n', '\r\n'), newline='')
+    return path
+
+
+def test_parse_ics_datetime():
+    assert parse_ics_datetime({}, '20250304T080000Z') == (
+        datetime(2025, 3, 4, 8, tzinfo=timezone.utc).timestamp(), False
+    )
+    assert parse_ics_datetime({'TZID': 'Europe/Berlin'}, '20250304T120000') == (berlin(4, 12), False)
+    assert parse_ics_datetime({'VALUE': 'DATE'}, '20250304')[1] is True
+    # Unknown TZIDs and floating times are local time
+    assert parse_ics_datetime({'TZID': 'Nowhere/Nothing'}, '20250304T120000') == (
+        datetime(2025, 3, 4, 12).timestamp(), False
+    )
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('PT30M', timedelta(minutes=30)),
+    ('P1DT2H', timedelta(days=1, hours=2)),
+    ('P2W', timedelta(weeks=2)),
+    ('-PT15M', timedelta(minutes=-15)),
+])
+def test_parse_ics_duration(value, expected):
+    assert parse_ics_duration(value) == expected
+
+
+def test_parse_ics_duration_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_ics_duration('30 minutes')
+
+
+def test_iter_vevents_unfolds_and_skips_nested_components(ics_path):
+    with open(ics_path, 'r', newline='') as f:
+        events = {event['UID'][0][1]: event for event in iter_vevents(f)}
+    assert events['utc']['SUMMARY'][0][1] == 'A long summary that is folded onto a second line'
+    # The VALARM's DTSTART is not taken as the event's
+    assert events['zoned']['DTSTART'] == [({'TZID': 'Europe/Berlin'}, '20250304T120000')]
+
+
+def test_backend_names_calendars_and_reads_events(ics_path):
+    backend = ICSCalendarBackend(str(ics_path))
+    assert backend.list_calendars() == ['Work']
+    # The all-day, cancelled and malformed events are skipped; EXDATE removes
+    # the standup on the 5th and COUNT ends it after the 7th
+    assert fetch(backend) == [
+        (berlin(3, 9), berlin(3, 9, 15)),
+        (berlin(4, 9), berlin(4, 10)),  # 08:00Z
+        (berlin(4, 10), berlin(4, 10, 15)),  # Moved standup instance
+        (berlin(4, 12), berlin(4, 12, 30)),
+        (berlin(6, 9), berlin(6, 9, 15)),
+        (berlin(7, 9), berlin(7, 9, 15)),
+    ]
+
+
+def test_backend_picks_up_file_changes(ics_path):
+    backend = ICSCalendarBackend(str(ics_path))
+    assert len(fetch(backend)) == 6
+
+    ics_path.write_text(CALENDAR.replace('STATUS:CANCELLED', 'STATUS:CONFIRMED'))
+    stat = os.stat(ics_path)
+    os.utime(ics_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert len(fetch(backend)) == 7
+
+
+def test_concurrent_fetch_waits_for_refresh(ics_path, monkeypatch):
+    backend = ICSCalendarBackend(str(ics_path))
+    assert len(fetch(backend)) == 6
+    ics_path.write_text(CALENDAR.replace('STATUS:CANCELLED', 'STATUS:CONFIRMED'))
+    stat = os.stat(ics_path)
+    os.utime(ics_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    # Hold the first fetch inside the re-parse of the changed file
+    parsing, release = threading.Event(), threading.Event()
+    parse = ics_backend._CalendarIndex
+
+    def slow_parse(path):
+        parsing.set()
+        release.wait(5)
+        return parse(path)
+    monkeypatch.setattr(ics_backend, '_CalendarIndex', slow_parse)
+
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault('first', fetch(backend)))
+    second = threading.Thread(target=lambda: results.setdefault('second', fetch(backend)))
+    first.start()
+    assert parsing.wait(5)
+    second.start()
+    second.join(0.2)
+    # The second fetch must not answer from the stale day cache meanwhile
+    assert 'second' not in results
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert len(results['first']) == len(results['second']) == 7
+
+
+def test_directory_of_calendars(tmp_path, ics_path):
+    (tmp_path / 'Personal.ics').write_text('BEGIN:VCALENDAR\nEND:VCALENDAR\n')
+    backend = ICSCalendarBackend(str(tmp_path))
+    assert sorted(backend.list_calendars()) == ['Personal', 'Work']
+    assert backend.has_calendar('Personal')
+
+
+def test_missing_path_raises(tmp_path):
+    with pytest.raises(CalendarAccessError):
+        ICSCalendarBackend(str(tmp_path / 'missing.ics'))
@@ -0,0 +1,107 @@
+"""Randomized comparison of the sweep engine with the old slot subtraction"""
+import random
+
+import pytest
+
+from intervals import (common_free_gaps, free_gaps, free_gaps_in_windows, merge_intervals,
+                       quorum_free_gaps)
+
+SEEDS = range(300)
+
+
+def subtract_slots(window_start, window_end, busy, min_length):
+    """The pre-sweep get_available_slots algorithm, on minutes
+
+    Starts from the whole window and splits the remaining slots around each
+    busy period in turn, then drops slots shorter than min_length.
+    """
+    available = [(window_start, window_end)]
+    for busy_start, busy_end in busy:
+        remaining = []
+        for slot_start, slot_end in available:
+            if busy_start < slot_end and busy_end > slot_start:
+                if busy_start > slot_start:
+                    remaining.append((slot_start, busy_start))
+                if busy_end < slot_end:
+                    remaining.append((busy_end, slot_end))
+            else:
+                remaining.append((slot_start, slot_end))
+        available = remaining
+    return sorted((start, end) for start, end in available if end - start >= min_length)
+
+
+def random_busy(rng, window_start, window_end, count):
+    """Busy periods around a window, biased towards overlapping, touching and nested ones"""
+    busy = []
+    for _ in range(count):
+        kind = rng.random()
+        if busy and kind < 0.2:
+            # Touching the end of an earlier period
+            start = busy[rng.randrange(len(busy))][1]
+            end = start + rng.randint(1, 90)
+        elif busy and kind < 0.4:
+            # Nested inside an earlier period
+            outer_start, outer_end = busy[rng.randrange(len(busy))]
+            start = rng.randint(outer_start, outer_end - 1)
+            end = rng.randint(start + 1, outer_end)
+        else:
+            start = rng.randint(window_start - 120, window_end + 60)
+            end = start + rng.randint(1, 240)
+        busy.append((start, end))
+    rng.shuffle(busy)
+    return busy
+
+
+def columns(busy):
+    return [start for start, _ in busy], [end for _, end in busy]
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_free_gaps_matches_subtraction(seed):
+    rng = random.Random(seed)
+    window_start = rng.randint(0, 10000)
+    window_end = window_start + rng.randint(1, 720)
+    busy = random_busy(rng, window_start, window_end, rng.randint(0, 25))
+    min_length = rng.choice((1, 15, 30, 60))
+
+    merged_starts, merged_ends = merge_intervals(*columns(busy))
+    assert free_gaps(window_start, window_end, merged_starts, merged_ends, min_length) == \
+        subtract_slots(window_start, window_end, busy, min_length)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_free_gaps_in_windows_matches_subtraction(seed):
+    rng = random.Random(seed)
+    window_starts, window_ends = [], []
+    start = rng.randint(0, 1000)
+    for _ in range(rng.randint(1, 10)):
+        window_starts.append(start)
+        window_ends.append(start + rng.randint(1, 900))
+        start += 1440
+    busy = random_busy(rng, window_starts[0], window_ends[-1], rng.randint(0, 80))
+    min_length = rng.choice((1, 15, 30, 60))
+
+    merged_starts, merged_ends = merge_intervals(*columns(busy))
+    gaps = free_gaps_in_windows(window_starts, window_ends, merged_starts, merged_ends, min_length)
+    assert gaps == [
+        subtract_slots(window_start, window_end, busy, min_length)
+        for window_start, window_end in zip(window_starts, window_ends)
+    ]
+
+
+def test_merge_intervals_collapses_touching_and_nested():
+    starts, ends = merge_intervals([30, 0, 10, 60, 70], [60, 10, 20, 60, 80])
+    assert list(zip(starts, ends)) == [(0, 20), (30, 60), (70, 80)]
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_common_and_quorum_gaps_match_subtraction(seed):
+    rng = random.Random(seed)
+    window_start, window_end = 0, rng.randint(60, 720)
+    attendees = [random_busy(rng, window_start, window_end, rng.randint(0, 8)) for _ in range(rng.randint(1, 4))]
+    busy_lists = [merge_intervals(*columns(busy)) for busy in attendees]
+
+    everyone = [period for busy in attendees for period in busy]
+    expected = subtract_slots(window_start, window_end, everyone, 1)
+    assert common_free_gaps(window_start, window_end, busy_lists, 1) == expected
+    assert quorum_free_gaps(window_start, window_end, busy_lists, len(attendees), 1) == expected
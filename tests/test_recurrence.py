@@ -0,0 +1,101 @@
+"""Closed-form recurrence expansion against dateutil"""
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from dateutil.rrule import rrulestr
+
+from recurrence import WEEKDAYS, RecurringSeries, wall_timestamp
+
+ZONE = ZoneInfo('America/New_York')  # Ranges below cross both DST changes
+DTSTART = datetime(2025, 1, 6, 9, 30)
+HOUR = 3600
+
+
+def reference(dtstart, duration, rule, zone, range_start, range_end, exdates=()):
+    """Occurrences by walking the whole series with dateutil"""
+    occurrences = []
+    for wall in rrulestr(f"RRULE:{rule}", dtstart=dtstart):
+        start_ts = int(wall_timestamp(wall, zone))
+        if start_ts > range_end:
+            break
+        if start_ts not in exdates and (start_ts + duration > range_start or start_ts >= range_start):
+            occurrences.append((start_ts, start_ts + duration))
+    return occurrences
+
+
+def random_rule(rng):
+    parts = [f"FREQ={rng.choice(('DAILY', 'WEEKLY'))}", f"INTERVAL={rng.randint(1, 4)}"]
+    if rng.random() < 0.6:
+        parts.append('BYDAY=' + ','.join(rng.sample(WEEKDAYS, rng.randint(1, 4))))
+    if rng.random() < 0.3:
+        parts.append(f"WKST={rng.choice(WEEKDAYS)}")
+    ending = rng.random()
+    if ending < 0.3:
+        parts.append(f"COUNT={rng.randint(1, 60)}")
+    elif ending < 0.6:
+        parts.append(f"UNTIL={(DTSTART + timedelta(days=rng.randint(0, 300))):%Y%m%dT%H%M%S}")
+    return ';'.join(parts)
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_closed_form_matches_dateutil(seed):
+    rng = random.Random(seed)
+    rule = random_rule(rng)
+    duration = rng.choice((15, 30, 60, 120)) * 60
+    series = RecurringSeries(DTSTART, duration, rule, zone=ZONE)
+    assert series.closed_form
+
+    range_start = int(wall_timestamp(DTSTART + timedelta(days=rng.randint(-10, 300)), ZONE))
+    range_end = range_start + rng.randint(1, 60) * 86400
+    # DTSTART always counts as the first occurrence, even when the rule skips it
+    expected = set(reference(DTSTART, duration, rule, ZONE, range_start, range_end))
+    first = int(wall_timestamp(DTSTART, ZONE))
+    if first <= range_end and first + duration > range_start:
+        expected.add((first, first + duration))
+    assert list(series.occurrences(range_start, range_end)) == sorted(expected)
+
+
+def test_occurrences_keep_wall_time_across_dst():
+    series = RecurringSeries(datetime(2025, 3, 7, 9, 0), HOUR, 'FREQ=DAILY;COUNT=4', zone=ZONE)
+    walls = [datetime.fromtimestamp(start, ZONE).replace(tzinfo=None)
+             for start, _ in series.occurrences(0, int(wall_timestamp(datetime(2025, 4, 1), ZONE)))]
+    assert walls == [datetime(2025, 3, day, 9, 0) for day in (7, 8, 9, 10)]
+
+
+def test_exdate_and_exclude_drop_instances():
+    dtstart = datetime(2025, 1, 6, 9, 0)
+    second = int(wall_timestamp(datetime(2025, 1, 7, 9, 0), ZONE))
+    third = int(wall_timestamp(datetime(2025, 1, 8, 9, 0), ZONE))
+    series = RecurringSeries(dtstart, HOUR, 'FREQ=DAILY;COUNT=5', exdates=[second], zone=ZONE)
+    series.exclude(third)
+    range_end = int(wall_timestamp(datetime(2025, 2, 1), ZONE))
+    assert list(series.occurrences(0, range_end)) == reference(
+        dtstart, HOUR, 'FREQ=DAILY;COUNT=5', ZONE, 0, range_end, exdates={second, third}
+    )
+
+
+def test_rdates_without_rule():
+    rdates = [(1000 * HOUR, 1001 * HOUR), (2000 * HOUR, 2002 * HOUR)]
+    series = RecurringSeries(datetime(2025, 1, 6, 9, 0), HOUR, rdates=rdates, zone=ZONE)
+    assert list(series.occurrences(1500 * HOUR, 3000 * HOUR)) == [(2000 * HOUR, 2002 * HOUR)]
+
+
+def test_other_rules_fall_back_to_dateutil():
+    rule = 'FREQ=MONTHLY;BYMONTHDAY=15;COUNT=6'
+    dtstart = datetime(2025, 1, 15, 14, 0)
+    series = RecurringSeries(dtstart, HOUR, rule, zone=ZONE)
+    assert not series.closed_form
+    range_end = int(wall_timestamp(datetime(2026, 1, 1), ZONE))
+    assert list(series.occurrences(0, range_end)) == reference(dtstart, HOUR, rule, ZONE, 0, range_end)
+
+
+def test_unbounded_series_has_no_last_end():
+    assert RecurringSeries(DTSTART, HOUR, 'FREQ=WEEKLY', zone=ZONE).bounds()[1] is None
+
+
+@pytest.mark.parametrize('rule', ['FREQ=FORTNIGHTLY', 'FREQ=DAILY;INTERVAL=0'])
+def test_invalid_rules_raise(rule):
+    with pytest.raises(ValueError):
+        RecurringSeries(DTSTART, HOUR, rule, zone=ZONE)
@@ -0,0 +1,79 @@
+"""HTTP availability service: request framing and configuration"""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+import calendar_backend
+import config
+from calendar_backend import MemoryCalendarBackend
+from server import AvailabilityServer
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = config.ConfigStore(str(tmp_path / 'config.json'), save_delay=60)
+    monkeypatch.setattr(config.ConfigStore, '_instance', store)
+    memory = MemoryCalendarBackend()
+    day = datetime(2025, 3, 4)
+    memory.set_events('Work', [day.replace(hour=10).timestamp()], [day.replace(hour=11).timestamp()])
+    memory.set_events('Home', [], [])
+    calendar_backend.set_backend(memory)
+    yield store
+    calendar_backend.set_backend(None)
+
+
+def exchange(*requests):
+    """Send raw requests on one connection and return the parsed responses
+
+    A callable among the requests is run at that point instead.
+    """
+    async def run():
+        server = AvailabilityServer()
+        listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        responses = []
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for request in requests:
+                if callable(request):
+                    request()
+                    continue
+                writer.write(request)
+                await writer.drain()
+                status = int((await reader.readline()).split()[1])
+                length = 0
+                while (line := await reader.readline()) not in (b'\r\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                responses.append((status, json.loads(await reader.readexactly(length))))
+            writer.close()
+        server.executor.shutdown()
+        return responses
+    return asyncio.run(asyncio.wait_for(run(), 10))
+
+
+def get(path):
+    return f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+
+
+def test_body_of_rejected_request_is_not_read_as_the_next_request(store):
+    body = b'GET /nope HTTP/1.1\r\n\r\n'
+    post = b'POST /availability HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body) + body
+    responses = exchange(post, get('/health'))
+    assert responses == [(405, {'error': 'Only GET is supported'}), (200, {'status': 'ok'})]
+
+
+def test_settings_changes_reach_a_running_server(store):
+    query = get('/availability?dates=2025-03-04&duration=30')
+    store.save({'selected_calendar': 'Home', 'working_hours': {'start': '09:00', 'end': '09:15'}})
+    store.flush()
+
+    def change_settings():
+        store.save({'selected_calendar': 'Work', 'working_hours': {'start': '13:00', 'end': '15:00'}})
+    (status, before), (_, after) = exchange(query, change_settings, query)
+    assert status == 200
+    assert before['slots']['2025-03-04'] == []
+    assert len(after['slots']['2025-03-04']) == 1
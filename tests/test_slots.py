@@ -0,0 +1,62 @@
+"""Slot computation against an in-memory calendar backend"""
+from datetime import datetime
+
+import pytest
+
+import calendar_backend
+from calendar_backend import CalendarAccessError, MemoryCalendarBackend
+from main import find_next_slots, get_available_slots, get_common_available_slots
+
+WORKING_HOURS = {'start': '09:00', 'end': '17:00'}
+DAY = datetime(2025, 3, 4)
+
+
+def at(hour, minute=0):
+    return DAY.replace(hour=hour, minute=minute)
+
+
+def ts(hour, minute=0):
+    return at(hour, minute).timestamp()
+
+
+def naive(slots):
+    return [(start.replace(tzinfo=None), end.replace(tzinfo=None)) for start, end in slots]
+
+
+@pytest.fixture
+def backend():
+    memory = MemoryCalendarBackend()
+    memory.set_events('A', [ts(10), ts(13)], [ts(11), ts(14)])
+    memory.set_events('B', [ts(10, 30), ts(15)], [ts(12), ts(16)])
+    calendar_backend.set_backend(memory)
+    yield memory
+    calendar_backend.set_backend(None)
+
+
+def test_available_slots(backend):
+    assert naive(get_available_slots('A', DAY, WORKING_HOURS, 60)) == [
+        (at(9), at(10)), (at(11), at(13)), (at(14), at(17))
+    ]
+
+
+def test_common_slots(backend):
+    slots = get_common_available_slots(['A', 'B'], [DAY], WORKING_HOURS, 60)
+    assert naive(slots[DAY.date()]) == [(at(9), at(10)), (at(12), at(13)), (at(14), at(15)), (at(16), at(17))]
+
+
+def test_quorum_slots(backend):
+    slots = get_common_available_slots(['A', 'B'], [DAY], WORKING_HOURS, 60, quorum=1)
+    assert naive(slots[DAY.date()]) == [(at(9), at(10, 30)), (at(11), at(17))]
+
+
+def test_missing_calendar_is_an_error_not_free_time(backend):
+    with pytest.raises(CalendarAccessError):
+        get_available_slots('Nope', DAY, WORKING_HOURS, 60)
+    with pytest.raises(CalendarAccessError):
+        find_next_slots('Nope', 3, WORKING_HOURS, 60, start=DAY)
+
+
+@pytest.mark.parametrize('quorum', [None, 1])
+def test_unreadable_attendee_fails_the_query(backend, quorum):
+    with pytest.raises(CalendarAccessError):
+        get_common_available_slots(['A', 'Nope'], [DAY], WORKING_HOURS, 60, quorum=quorum)
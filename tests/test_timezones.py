@@ -0,0 +1,95 @@
+"""Local zone detection and DST handling of working hours"""
+import time
+from datetime import date, datetime
+
+import pytest
+
+import calendar_backend
+import timezones
+from calendar_backend import MemoryCalendarBackend
+from main import get_available_slots
+from timezones import get_zone, local_zone_name, wall_time_to_epoch
+
+NEW_YORK_RULES = 'EST+5EDT,M3.2.0,M11.1.0'  # POSIX TZ with no IANA name
+
+
+def _reset_local_zone():
+    time.tzset()
+    timezones._local_zone = None
+    get_zone.cache_clear()
+    wall_time_to_epoch.cache_clear()
+
+
+@pytest.fixture
+def local_tz(monkeypatch):
+    """Set the process's TZ for one test"""
+    def set_tz(value):
+        monkeypatch.setenv('TZ', value)
+        _reset_local_zone()
+    yield set_tz
+    monkeypatch.undo()
+    _reset_local_zone()
+
+
+def wall(epoch_seconds, zone=None):
+    return datetime.fromtimestamp(epoch_seconds, zone or get_zone()).replace(tzinfo=None)
+
+
+@pytest.mark.parametrize('tz, name', [
+    ('America/New_York', 'America/New_York'),
+    (':Europe/Berlin', 'Europe/Berlin'),
+    ('EST+5', 'EST'),
+    (NEW_YORK_RULES, None),
+])
+def test_local_zone_follows_the_process(local_tz, tz, name):
+    local_tz(tz)
+    if name:
+        assert local_zone_name() == name
+    for month in range(1, 13):
+        naive = datetime(2025, month, 15, 9, 0)
+        assert naive.replace(tzinfo=get_zone()).timestamp() == naive.timestamp()
+
+
+@pytest.mark.parametrize('tz', ['EST+5', 'America/New_York', NEW_YORK_RULES])
+def test_working_hours_match_naive_local_events(local_tz, tz):
+    local_tz(tz)
+    day = datetime(2025, 3, 4)
+    backend = MemoryCalendarBackend()
+    backend.set_events('Work', [day.replace(hour=10).timestamp()], [day.replace(hour=11).timestamp()])
+    calendar_backend.set_backend(backend)
+    try:
+        slots = get_available_slots('Work', day, {'start': '09:00', 'end': '17:00'}, 30)
+    finally:
+        calendar_backend.set_backend(None)
+    assert [(start.replace(tzinfo=None), end.replace(tzinfo=None)) for start, end in slots] == [
+        (day.replace(hour=9), day.replace(hour=10)),
+        (day.replace(hour=11), day.replace(hour=17)),
+    ]
+
+
+@pytest.mark.parametrize('tz', ['America/New_York', NEW_YORK_RULES])
+def test_dst_gap_moves_forward_and_overlap_takes_first(local_tz, tz):
+    local_tz(tz)
+    # 02:30 does not exist on 2025-03-09 and moves to 03:30 EDT
+    assert wall(wall_time_to_epoch(date(2025, 3, 9), '02:30')) == datetime(2025, 3, 9, 3, 30)
+    # 01:30 happens twice on 2025-11-02; the first is EDT (UTC-4)
+    first = wall_time_to_epoch(date(2025, 11, 2), '01:30')
+    assert first == datetime(2025, 11, 2, 5, 30).replace(tzinfo=get_zone('UTC')).timestamp()
+    # A normal summer day
+    assert wall(wall_time_to_epoch(date(2025, 7, 1), '09:00')) == datetime(2025, 7, 1, 9, 0)
+
+
+def test_explicit_zones_ignore_the_local_zone(local_tz):
+    local_tz('EST+5')
+    epoch = wall_time_to_epoch(date(2025, 7, 1), '09:00', 'Europe/Berlin')
+    assert wall(epoch, get_zone('Europe/Berlin')) == datetime(2025, 7, 1, 9, 0)
+    assert epoch == datetime(2025, 7, 1, 7, 0).replace(tzinfo=get_zone('UTC')).timestamp()
+
+
+def test_process_local_zone_round_trips(local_tz):
+    local_tz(NEW_YORK_RULES)
+    zone = get_zone()
+    for ts in range(1741500000, 1741520000, 900):  # Across the 2025 spring-forward
+        local = datetime.fromtimestamp(ts, zone)
+        assert local.timestamp() == ts
+        assert local.replace(tzinfo=None) == datetime.fromtimestamp(ts)
@@ -0,0 +1,93 @@
+"""Process-wide location to timezone resolution
+
+Keeps one Nominatim client and one TimezoneFinder for the life of the
+process. TimezoneFinder's polygon data is the slow part, so it is loaded
+once, in memory, and can be warmed up on a background thread at startup.
+"""
+import sys
+import threading
+
+from gazetteer import Gazetteer
+from geocache import GeocodeCache, MISS
+
+
+class TimezoneResolver:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Singleton pattern so every lookup reuses the loaded data"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._finder = None
+        self._geolocator = None
+        self._finder_lock = threading.Lock()
+        self._warm_up_thread = None
+
+    def warm_up(self):
+        """Load the gazetteer and TimezoneFinder on a background thread"""
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self._warm_up, name="timezone-warm-up", daemon=True)
+            self._warm_up_thread.start()
+
+    def _warm_up(self):
+        try:
+            Gazetteer.get_instance().resolve('utc')
+            self._get_finder()
+        except Exception as e:
+            print(f"Timezone resolver warm-up failed: {e}", file=sys.stderr)
+
+    def _get_finder(self):
+        # Callers racing the warm-up thread wait for it instead of loading twice
+        with self._finder_lock:
+            if self._finder is None:
+                from timezonefinder import TimezoneFinder
+                self._finder = TimezoneFinder(in_memory=True)
+            return self._finder
+
+    def _get_geolocator(self):
+        if self._geolocator is None:
+            from geopy.geocoders import Nominatim
+            # Initialize the geocoder with a unique user agent
+            self._geolocator = Nominatim(user_agent="meeting_coordinator")
+        return self._geolocator
+
+    def timezone_at(self, lat, lng):
+        """Return the timezone name at a coordinate, or None"""
+        return self._get_finder().timezone_at(lat=lat, lng=lng)
+
+    def resolve(self, location):
+        """Convert a location name to a timezone
+
+        Well-known places are resolved offline from the bundled gazetteer.
+        Other results, including failed lookups, are kept in the persistent
+        geocode cache; Nominatim is only asked on a cache miss.
+        """
+        timezone_str = Gazetteer.get_instance().resolve(location)
+        if timezone_str:
+            return timezone_str
+
+        cache = GeocodeCache.get_instance()
+        cached = cache.get(location)
+        if cached is not MISS:
+            return cached[2] if cached else None
+
+        try:
+            # Get location coordinates
+            location_data = self._get_geolocator().geocode(location)
+            if location_data is None:
+                cache.put(location, None)
+                return None
+
+            # Get timezone from coordinates
+            timezone_str = self.timezone_at(location_data.latitude, location_data.longitude)
+            cache.put(location, (location_data.latitude, location_data.longitude, timezone_str) if timezone_str else None)
+            return timezone_str
+        except Exception:
+            # Network errors are not cached so the next attempt can succeed
+            return None
@@ -0,0 +1,176 @@
+"""Timezone service for the slot engine
+
+Backed by zoneinfo. Detects the machine's real local zone instead of
+assuming one, memoizes zone objects, and memoizes the per-day conversions
+the engine needs (working-hour boundaries as epoch seconds), so checking
+many dates does no repeated localization work. Results are converted back
+to datetimes a whole list at a time.
+
+DST-boundary days are handled explicitly: a working-hours time that falls
+in a spring-forward gap moves forward by the length of the gap, and an
+ambiguous fall-back time resolves to its first occurrence.
+
+The local zone must be the one the process itself uses: calendar backends
+bucket events by day and read floating times with naive local datetimes,
+which follow TZ and /etc/localtime through the C library. A detected IANA
+name is only used if it agrees with that; otherwise (e.g. TZ='EST+5', or a
+copied /etc/localtime) the local zone follows the process's local time
+directly.
+"""
+import os
+import time
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+EPOCH = datetime(1970, 1, 1)
+ZONEINFO_MARKER = 'zoneinfo/'
+
+_local_zone = None  # (name, tzinfo)
+
+
+class _ProcessLocalZone(tzinfo):
+    """The process's local time as the C library sees it, as a tzinfo
+
+    Gap and fold handling match ZoneInfo: fold=0 takes the offset before a
+    transition.
+    """
+
+    def _timestamp(self, dt):
+        # Naive datetimes are local time, resolved by the C library
+        return dt.replace(tzinfo=None).timestamp()
+
+    def utcoffset(self, dt):
+        wall = dt.replace(tzinfo=None)
+        return timedelta(seconds=round((wall - EPOCH).total_seconds() - wall.timestamp()))
+
+    def dst(self, dt):
+        if time.localtime(self._timestamp(dt)).tm_isdst <= 0:
+            return timedelta(0)
+        return self.utcoffset(dt) - timedelta(seconds=-time.timezone)
+
+    def tzname(self, dt):
+        return time.localtime(self._timestamp(dt)).tm_zone
+
+    def fromutc(self, dt):
+        local = datetime.fromtimestamp((dt.replace(tzinfo=None) - EPOCH).total_seconds())
+        return local.replace(tzinfo=self)
+
+    def __repr__(self):
+        return '_ProcessLocalZone()'
+
+
+PROCESS_LOCAL_ZONE = _ProcessLocalZone()
+
+
+def _zone_name_from_path(path):
+    """The IANA name of a path into a zoneinfo tree, or None"""
+    if ZONEINFO_MARKER in path:
+        name = path.split(ZONEINFO_MARKER, 1)[1]
+        if is_valid_zone(name):
+            return name
+    return None
+
+
+def _detect_local_zone_name():
+    """Find the IANA name of the machine's zone, or None if it can't be told"""
+    tz_env = os.environ.get('TZ', '').lstrip(':')
+    if tz_env:
+        # The C library follows TZ and ignores /etc/localtime, so must we
+        if is_valid_zone(tz_env):
+            return tz_env
+        return _zone_name_from_path(tz_env)
+
+    # /etc/localtime links into a zoneinfo tree on both macOS and Linux
+    try:
+        name = _zone_name_from_path(os.path.realpath('/etc/localtime'))
+    except OSError:
+        name = None
+    if name:
+        return name
+
+    try:
+        with open('/etc/timezone', 'r') as f:
+            name = f.read().strip()
+        if is_valid_zone(name):
+            return name
+    except OSError:
+        pass
+    return None
+
+
+def _agrees_with_process(zone):
+    """Check that zone has the process's local UTC offsets over the coming year"""
+    now = int(time.time())
+    for month in range(13):
+        ts = now + month * 30 * 86400
+        if datetime.fromtimestamp(ts, zone).utcoffset().total_seconds() != time.localtime(ts).tm_gmtoff:
+            return False
+    return True
+
+
+def _get_local_zone():
+    global _local_zone
+    if _local_zone is None:
+        name = _detect_local_zone_name()
+        if name and _agrees_with_process(ZoneInfo(name)):
+            _local_zone = (name, ZoneInfo(name))
+        else:
+            _local_zone = (time.strftime('%Z') or 'local', PROCESS_LOCAL_ZONE)
+    return _local_zone
+
+
+def local_zone_name():
+    """Return the IANA name of the local zone, or its abbreviation (e.g. 'EST') if it has none"""
+    return _get_local_zone()[0]
+
+
+@lru_cache(maxsize=None)
+def is_valid_zone(name):
+    """Check whether name is a known IANA timezone"""
+    if not name:
+        return False
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_zone(name=None):
+    """Return the ZoneInfo for name, or the local zone's tzinfo if name is None"""
+    return ZoneInfo(name) if name else _get_local_zone()[1]
+
+
+def _resolve(day, hour, minute, zone):
+    """Epoch seconds of a wall time, handling DST gaps and overlaps
+
+    fold=0 resolves an ambiguous (fall-back) time to its first occurrence
+    and moves a time inside a spring-forward gap forward by the gap's length.
+    """
+    return int(datetime(day.year, day.month, day.day, hour, minute, tzinfo=zone, fold=0).timestamp())
+
+
+@lru_cache(maxsize=4096)
+def wall_time_to_epoch(day, hhmm, zone_name=None):
+    """Convert a date and 'HH:MM' wall time in a zone to epoch seconds
+
+    Args:
+        day (date): The calendar date
+        hhmm (str): Wall-clock time, 24h format
+        zone_name (str): IANA zone, or None for the local zone
+    """
+    hour, minute = (int(part) for part in hhmm.split(':'))
+    return _resolve(day, hour, minute, get_zone(zone_name))
+
+
+def to_datetimes(epoch_seconds, zone):
+    """Convert a sequence of epoch seconds to aware datetimes in one zone
+
+    Args:
+        epoch_seconds (sequence): Times to convert
+        zone (tzinfo): Display zone, e.g. from get_zone
+    """
+    fromtimestamp = datetime.fromtimestamp
+    return [fromtimestamp(ts, zone) for ts in epoch_seconds]
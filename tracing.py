@@ -0,0 +1,201 @@
+"""Lightweight performance tracing
+
+Stages are timed with the span() context manager or the traced decorator,
+using time.perf_counter_ns. Tracing is off by default; a disabled span is a
+shared no-op object, so instrumented code pays one global lookup per call.
+
+Enable it with the MEETING_COORDINATOR_TRACE environment variable:
+
+    MEETING_COORDINATOR_TRACE=memory            keep per-stage durations in memory
+                                                and print a p50/p95 summary at exit
+    MEETING_COORDINATOR_TRACE=trace.jsonl       also append one JSON line per span
+
+or from code with enable() / disable(). stats() returns the per-stage
+summary, so many runs (e.g. a --batch file) can be aggregated.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+MAX_SAMPLES = 10000  # Per stage; older samples are overwritten
+
+_enabled = False
+_export_file = None
+_lock = threading.Lock()
+_samples = defaultdict(lambda: array('q'))  # stage -> durations in ns
+_counts = defaultdict(int)
+_local = threading.local()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'attrs', 'start_ns', 'parent')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+
+    def set(self, **attrs):
+        """Attach attributes (e.g. result sizes) to the exported record"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        _local.stack.pop()
+        _record(self, duration_ns, exc_type)
+        return False
+
+
+def _record(current, duration_ns, exc_type):
+    with _lock:
+        samples = _samples[current.name]
+        count = _counts[current.name]
+        if count < MAX_SAMPLES:
+            samples.append(duration_ns)
+        else:
+            samples[count % MAX_SAMPLES] = duration_ns
+        _counts[current.name] = count + 1
+
+        if _export_file is not None:
+            record = {
+                'span': current.name,
+                'duration_ms': duration_ns / 1e6,
+                'start_ns': current.start_ns,
+                'thread': threading.current_thread().name,
+            }
+            if current.parent:
+                record['parent'] = current.parent
+            if exc_type is not None:
+                record['error'] = exc_type.__name__
+            record.update(current.attrs)
+            _export_file.write(json.dumps(record, default=str) + '\n')
+
+
+def span(name, **attrs):
+    """Time a block of code as stage `name`
+
+    Usage:
+        with span('calendar.query', days=7) as s:
+            ...
+            s.set(events=len(events))
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+def traced(name=None):
+    """Decorator timing every call of a function as one span"""
+    def decorator(func):
+        stage = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(stage, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable(path=None):
+    """Start recording spans, optionally appending them to a JSON-lines file"""
+    global _enabled, _export_file
+    with _lock:
+        if _export_file is not None:
+            _export_file.close()
+            _export_file = None
+        if path:
+            _export_file = open(path, 'a', buffering=1)
+        _enabled = True
+
+
+def disable():
+    """Stop recording spans; collected stats are kept"""
+    global _enabled, _export_file
+    with _lock:
+        _enabled = False
+        if _export_file is not None:
+            _export_file.close()
+            _export_file = None
+
+
+def reset():
+    """Drop collected stats"""
+    with _lock:
+        _samples.clear()
+        _counts.clear()
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def stats():
+    """Return {stage: {'count', 'p50_ms', 'p95_ms', 'max_ms'}} over the kept samples"""
+    with _lock:
+        snapshot = {stage: (sorted(samples), _counts[stage]) for stage, samples in _samples.items()}
+    return {
+        stage: {
+            'count': count,
+            'p50_ms': _percentile(values, 0.50) / 1e6,
+            'p95_ms': _percentile(values, 0.95) / 1e6,
+            'max_ms': values[-1] / 1e6,
+        }
+        for stage, (values, count) in sorted(snapshot.items()) if values
+    }
+
+
+def report():
+    """Format stats() as a table"""
+    lines = [f"{'stage':<24} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    for stage, summary in stats().items():
+        lines.append(
+            f"{stage:<24} {summary['count']:>7} {summary['p50_ms']:>9.2f} "
+            f"{summary['p95_ms']:>9.2f} {summary['max_ms']:>9.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def _print_report():
+    if _counts:
+        print(report(), file=sys.stderr)
+
+
+_setting = os.environ.get('MEETING_COORDINATOR_TRACE', '')
+if _setting:
+    enable(None if _setting.lower() in ('1', 'memory') else _setting)
+    atexit.register(_print_report)